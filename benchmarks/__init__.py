@@ -0,0 +1 @@
+"""Benchmarks for the Torque Logger ingest path."""
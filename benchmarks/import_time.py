@@ -0,0 +1,64 @@
+"""Benchmark of importing the Torque Logger PID catalogue.
+
+Run from the repository root:
+
+    python -m benchmarks.import_time [component directory]
+
+const.py and catalogue.py are loaded from the component directory as
+submodules of a bare package, so neither the package __init__ nor Home
+Assistant is imported and only their own cost is measured. Each one is
+imported in a fresh interpreter, the best time of several runs and the
+memory it holds afterwards are reported; the catalogue is also loaded.
+
+Pass the directory of another checkout, e.g. a git worktree of an
+older commit, to compare with it. Modules it does not have are skipped.
+"""
+import os
+import subprocess
+import sys
+
+DIRECTORY = os.path.join("custom_components", "torque_logger")
+MODULES = ["const", "catalogue"]
+RUNS = 5
+
+# The standard library modules they use are loaded by Home Assistant
+# long before the integration, so they are imported before timing
+_IMPORT_SCRIPT = """
+import datetime, json, os, sys, time, tracemalloc, types, typing
+package = types.ModuleType("torque_logger")
+package.__path__ = [{directory!r}]
+sys.modules["torque_logger"] = package
+if {trace}:
+    tracemalloc.start()
+started = time.perf_counter()
+module = __import__("torque_logger.{module}", fromlist=["_"])
+if hasattr(module, "load"):
+    module.load()
+elapsed = time.perf_counter() - started
+print(elapsed, tracemalloc.get_traced_memory()[0])
+"""
+
+
+def _run(directory: str, module: str, trace: bool) -> tuple[float, int]:
+    output = subprocess.run(
+        [sys.executable, "-c", _IMPORT_SCRIPT.format(
+            directory=directory, module=module, trace=trace)],
+        capture_output=True, check=True, text=True,
+    ).stdout.split()
+    return float(output[0]), int(output[1])
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    directory = os.path.abspath(sys.argv[1] if len(sys.argv) > 1 else DIRECTORY)
+    print(directory)
+    for module in MODULES:
+        if not os.path.exists(os.path.join(directory, f"{module}.py")):
+            continue
+        best = min(_run(directory, module, False)[0] for _ in range(RUNS))
+        _, held = _run(directory, module, True)
+        print(f"import {module:<10} {best * 1e3:7.2f} ms, held {held / 1024:7.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
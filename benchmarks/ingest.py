@@ -0,0 +1,121 @@
+"""Replay benchmark of the /api/torque_logger ingest path.
+
+Run from the repository root with the development requirements
+installed:
+
+    python -m benchmarks.ingest
+
+Recorded Torque uploads are replayed through
+TorqueReceiveDataView.parse_fields, _get_data and _async_publish_data
+for fleets of 1 to 20 vehicles reporting 20 to 300 PIDs each. The
+coordinator is replaced by a stub that stores the per-car data but adds
+no entities, so only the integration's own work is measured. For every
+scenario it reports requests/second, p50/p99 latency per request and
+the memory allocated while replaying.
+"""
+import asyncio
+import statistics
+import time
+import tracemalloc
+
+from custom_components.torque_logger.api import TorqueReceiveDataView
+from custom_components.torque_logger.session import TorqueSessionStore
+
+from .torque_queries import EMAIL, metadata_query, parse_query, value_query
+
+SCENARIOS = [
+    # (vehicles, PIDs per vehicle)
+    (1, 20),
+    (1, 150),
+    (1, 300),
+    (5, 150),
+    (20, 20),
+    (20, 300),
+]
+SAMPLES = 50
+
+
+class StubCoordinator:
+    """Coordinator keeping the latest data per car, without entities."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.cars: dict[str, dict] = {}
+        self.updates = 0
+
+    def async_update_car(self, car_id: str, session_data: dict) -> None:
+        """Store the data of a car."""
+        self.cars.setdefault(car_id, {}).update(session_data)
+        self.updates += 1
+
+    async def add_entities(self, session_data: dict) -> None:
+        """Ignore entity discovery."""
+
+
+def _uploads(vehicles: int, pids: int):
+    """Return the parsed uploads of a fleet, metadata first."""
+    uploads = [
+        parse_query(metadata_query(f"session-{car}", f"Car {car}", pids))
+        for car in range(vehicles)
+    ]
+    for sample in range(SAMPLES):
+        uploads.extend(
+            parse_query(value_query(f"session-{car}", f"Car {car}", pids, sample))
+            for car in range(vehicles)
+        )
+    return uploads
+
+
+async def _replay(view: TorqueReceiveDataView, uploads: list) -> list[float]:
+    latencies = []
+    for query in uploads:
+        started = time.perf_counter()
+        session = view.parse_fields(query)
+        await view._async_publish_data(session)  # pylint: disable=protected-access
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def _percentile(values: list[float], percent: int) -> float:
+    return statistics.quantiles(values, n=100)[percent - 1]
+
+
+async def _run(vehicles: int, pids: int) -> None:
+    uploads = _uploads(vehicles, pids)
+    view = TorqueReceiveDataView(TorqueSessionStore(), EMAIL, False)
+    view.coordinator = StubCoordinator()
+
+    # Warm up caches with a first replay, then measure a fresh session set
+    await _replay(view, uploads)
+    view.data = TorqueSessionStore()
+
+    tracemalloc.start()
+    latencies = await _replay(view, uploads)
+    _, peak = tracemalloc.get_traced_memory()
+    allocated = sum(
+        stat.size for stat in tracemalloc.take_snapshot().statistics("filename"))
+    tracemalloc.stop()
+
+    # tracemalloc slows everything down, time another replay without it
+    view.data = TorqueSessionStore()
+    started = time.perf_counter()
+    latencies = await _replay(view, uploads)
+    elapsed = time.perf_counter() - started
+
+    print(
+        f"{vehicles:>3} cars x {pids:>3} PIDs: "
+        f"{len(uploads) / elapsed:8.0f} req/s, "
+        f"p50 {_percentile(latencies, 50) * 1e6:7.1f} us, "
+        f"p99 {_percentile(latencies, 99) * 1e6:7.1f} us, "
+        f"held {allocated / 1024:7.1f} KiB, peak {peak / 1024:7.1f} KiB"
+    )
+
+
+def main() -> None:
+    """Run every scenario and print the results."""
+    for vehicles, pids in SCENARIOS:
+        asyncio.run(_run(vehicles, pids))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Micro-benchmark of TorqueReceiveDataView.parse_fields.
+
+Run from the repository root with the development requirements
+installed:
+
+    python -m benchmarks.parse_fields
+
+It reports requests/second for the precompiled field classifier and for
+the chain of startswith checks it replaced, over recorded metadata and
+value uploads.
+"""
+import timeit
+
+from custom_components.torque_logger.api import (
+    TorqueReceiveDataView,
+    _classify_field,
+)
+from custom_components.torque_logger.session import TorqueSessionStore
+
+from .torque_queries import EMAIL, metadata_query, parse_query, value_query
+
+PIDS = 150
+REPEAT = 5
+NUMBER = 200
+
+
+def _legacy_classify(key: str):
+    """Classify a key with the startswith chain parse_fields used to run."""
+    if key.startswith("userUnit"):
+        return None, None
+    if key.startswith("userShortName"):
+        return "shortName", key[13:]
+    if key.startswith("userFullName"):
+        return "fullName", key[12:]
+    if key.startswith("defaultUnit"):
+        return "defaultUnit", key[11:]
+    if key.startswith("k"):
+        item = key[1:]
+        return "value", "0" + item if len(item) == 1 else item
+    if key.startswith("profile"):
+        return "profile", key[7:]
+    if key == "eml":
+        return "profile", "email"
+    if key == "time":
+        return "time", None
+    if key == "v":
+        return "profile", "version"
+    if key == "session":
+        return None, None
+    if key == "id":
+        return "profile", "id"
+    return "unknown", None
+
+
+def _rate(func) -> float:
+    best = min(timeit.repeat(func, repeat=REPEAT, number=NUMBER))
+    return NUMBER / best
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    uploads = {
+        "metadata": parse_query(metadata_query("1", "Car", PIDS)),
+        "values": parse_query(value_query("1", "Car", PIDS, 1)),
+    }
+    view = TorqueReceiveDataView(TorqueSessionStore(), EMAIL, False)
+
+    print(f"{PIDS} PIDs per upload")
+    for name, query in uploads.items():
+        keys = list(query)
+        assert [_legacy_classify(key) for key in keys] == [
+            _classify_field(key) for key in keys
+        ]
+        legacy = _rate(lambda: [_legacy_classify(key) for key in keys])
+        compiled = _rate(lambda: [_classify_field(key) for key in keys])
+        parse = _rate(lambda: view.parse_fields(query))
+        print(
+            f"{name:>8}: classify {legacy:9.0f} -> {compiled:9.0f} req/s"
+            f" ({compiled / legacy:.1f}x), parse_fields {parse:9.0f} req/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
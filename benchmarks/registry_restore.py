@@ -0,0 +1,80 @@
+"""Benchmark of the registry lookups done by sensor.async_setup_entry.
+
+Run from the repository root with the development requirements
+installed:
+
+    python -m benchmarks.registry_restore
+
+It builds a synthetic entity registry of 50k entities, a few hundred of
+them belonging to Torque cars, and times the old scan of every entity
+for every Torque device against the device id index used now.
+"""
+from types import SimpleNamespace
+import timeit
+
+from homeassistant.helpers import entity_registry as er
+
+ENTITIES = 50_000
+CARS = 5
+SENSORS_PER_CAR = 80
+REPEAT = 5
+NUMBER = 10
+
+
+def _build_registry():
+    registry = SimpleNamespace(entities=er.EntityRegistryItems())
+    for index in range(ENTITIES - CARS * SENSORS_PER_CAR):
+        entity_id = f"sensor.other_{index}"
+        registry.entities[entity_id] = er.RegistryEntry(
+            entity_id=entity_id,
+            unique_id=f"other_{index}",
+            platform="other",
+            device_id=f"other_device_{index // 10}",
+        )
+    for car in range(CARS):
+        for index in range(SENSORS_PER_CAR):
+            entity_id = f"sensor.car_{car}_pid_{index}"
+            registry.entities[entity_id] = er.RegistryEntry(
+                entity_id=entity_id,
+                unique_id=f"torque_logger_entry_car_{car}_pid_{index}",
+                platform="torque_logger",
+                device_id=f"car_{car}",
+                config_entry_id="entry",
+            )
+    return registry
+
+
+def _legacy(registry, device_ids):
+    return [
+        entity
+        for device_id in device_ids
+        for entity in registry.entities.values()
+        if entity.device_id == device_id and entity.domain == "sensor"
+    ]
+
+
+def _indexed(registry, device_ids):
+    return [
+        entity
+        for device_id in device_ids
+        for entity in er.async_entries_for_device(
+            registry, device_id, include_disabled_entities=True)
+        if entity.domain == "sensor"
+    ]
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    registry = _build_registry()
+    device_ids = [f"car_{car}" for car in range(CARS)]
+    assert len(_legacy(registry, device_ids)) == len(_indexed(registry, device_ids))
+
+    print(f"{ENTITIES} entities, {CARS} cars with {SENSORS_PER_CAR} sensors each")
+    for name, func in (("scan", _legacy), ("index", _indexed)):
+        best = min(timeit.repeat(
+            lambda func=func: func(registry, device_ids), repeat=REPEAT, number=NUMBER))
+        print(f"{name:>6}: {best / NUMBER * 1000:8.3f} ms per setup")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Recorded Torque Pro upload query strings used by the benchmarks.
+
+Torque sends two kinds of GET requests to /api/torque_logger: metadata
+uploads naming every PID once per session, and value uploads carrying
+one sample of every PID. The PIDs below are the ones sent by a real
+Torque Pro 1.12 profile, cycled to reach larger PID counts.
+"""
+from urllib.parse import parse_qsl, urlencode
+
+EMAIL = "driver@example.com"
+
+RECORDED_PIDS = [
+    ("04", "Load", "Engine Load", "%", "38.82"),
+    ("05", "Coolant", "Coolant Temperature", "°C", "87"),
+    ("0c", "Revs", "Engine RPM", "rpm", "1843.5"),
+    ("0d", "Speed", "Speed (OBD)", "km/h", "62"),
+    ("0f", "Intake", "Intake Air Temperature", "°C", "31"),
+    ("10", "MAF", "Mass Air Flow Rate", "g/s", "12.48"),
+    ("11", "Throttle", "Throttle Position(Manifold)", "%", "17.25"),
+    ("2f", "Fuel", "Fuel Level (From Engine ECU)", "%", "64.31"),
+    ("ff1001", "GPS Spd", "Speed (GPS)", "km/h", "61.2"),
+    ("ff1005", "Lon", "GPS Longitude", "°", "-46.6361"),
+    ("ff1006", "Lat", "GPS Latitude", "°", "-23.5475"),
+    ("ff1010", "GPS Height", "GPS Altitude", "m", "762.0"),
+    ("ff1239", "GPS Acc", "GPS Accuracy", "m", "4.0"),
+    ("ff123a", "GPS Sat", "GPS Satellites", "", "11"),
+    ("ff1201", "MPG", "Miles Per Gallon(Instant)", "mpg", "34.7"),
+    ("ff1203", "KPL", "Kilometers Per Litre(Instant)", "kpl", "14.75"),
+    ("ff1204", "Trip", "Trip Distance", "km", "18.12"),
+    ("ff1207", "LPK", "Litres Per 100 Kilometer(Instant)", "l/100km", "6.78"),
+    ("ff125a", "Flow", "Fuel flow rate/hour", "l/hr", "4.2"),
+    ("ff1266", "Trip Time", "Trip time(whilst moving)", "s", "1243"),
+]
+
+
+def _pids(count: int):
+    for index in range(count):
+        pid, short, full, unit, value = RECORDED_PIDS[index % len(RECORDED_PIDS)]
+        if index >= len(RECORDED_PIDS):
+            # Torque numbers user-defined PIDs as ff12xx/ff13xx and upward
+            pid = f"ff{0x1300 + index:04x}"
+            short = f"{short} {index}"
+            full = f"{full} {index}"
+        yield pid, short, full, unit, value
+
+
+def metadata_query(session: str, car: str, pids: int) -> str:
+    """Return the query string of a metadata upload."""
+    fields = [
+        ("eml", EMAIL),
+        ("v", "9"),
+        ("session", session),
+        ("id", f"profile-{car}"),
+        ("profileName", car),
+        ("profileFuelType", "0"),
+        ("profileWeight", "1400.0"),
+        ("profileVe", "85.0"),
+        ("profileFuelCost", "1.84"),
+        ("time", "1697620000000"),
+    ]
+    for pid, short, full, unit, _ in _pids(pids):
+        fields.append((f"userUnit{pid}", unit))
+        fields.append((f"userShortName{pid}", short))
+        fields.append((f"userFullName{pid}", full))
+        fields.append((f"defaultUnit{pid}", unit))
+    return urlencode(fields)
+
+
+def value_query(session: str, car: str, pids: int, sample: int) -> str:
+    """Return the query string of the n-th value upload of a session."""
+    fields = [
+        ("eml", EMAIL),
+        ("v", "9"),
+        ("session", session),
+        ("id", f"profile-{car}"),
+        ("time", str(1697620000000 + sample * 1000)),
+    ]
+    for index, (pid, _, _, _, value) in enumerate(_pids(pids)):
+        # Roughly a third of the PIDs move between two samples
+        if (index + sample) % 3 == 0:
+            value = f"{float(value) + sample % 7:.2f}"
+        fields.append((f"k{pid.lstrip('0') or '0'}", value))
+    return urlencode(fields)
+
+
+def parse_query(query: str) -> dict:
+    """Parse a query string the way aiohttp exposes request.query."""
+    return dict(parse_qsl(query, keep_blank_values=True))
@@ -8,21 +8,37 @@ import asyncio
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers.event import async_track_time_interval
 
+from . import catalogue
 from .coordinator import TorqueLoggerCoordinator
-from .api import TorqueReceiveDataView
+from .api import TorqueDataView, TorqueReceiveDataView
+from .importer import TorqueLogUploadView, async_register_services
+from .session import TorqueSessionStore
 
 from .const import (
     CONF_EMAIL,
+    CONF_IMPERIAL,
+    CONF_MAX_SESSIONS,
+    CONF_PUBLISH_INTERVAL,
+    CONF_SESSION_TTL,
+    DEFAULT_MAX_SESSIONS,
+    DEFAULT_PUBLISH_INTERVAL,
+    DEFAULT_SESSION_TTL,
     DOMAIN,
     PLATFORMS,
+    SESSION_SWEEP_INTERVAL,
     STARTUP_MESSAGE,
 )
 
 _LOGGER: logging.Logger = logging.getLogger(__package__)
 
-async def async_setup(*_):
+async def async_setup(hass: HomeAssistant, _config) -> bool:
     """Set up this integration using YAML is not supported."""
+    async_register_services(hass)
+    # Registered once, config entries are looked up on every request
+    hass.http.register_view(TorqueDataView(hass))
+    hass.http.register_view(TorqueLogUploadView(hass))
     return True
 
 
@@ -32,21 +48,39 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
         hass.data.setdefault(DOMAIN, {})
         _LOGGER.info(STARTUP_MESSAGE)
 
+    # Read the PID catalogue before any upload needs it
+    await hass.async_add_executor_job(catalogue.load)
+
     hass.data[DOMAIN][entry.entry_id] = {}
-    hass.data[DOMAIN][entry.entry_id]["data"] = {}
+    hass.data[DOMAIN][entry.entry_id]["data"] = TorqueSessionStore(
+        entry.options.get(CONF_MAX_SESSIONS, DEFAULT_MAX_SESSIONS),
+        entry.options.get(CONF_SESSION_TTL, DEFAULT_SESSION_TTL),
+    )
+    hass.data[DOMAIN][entry.entry_id]["options"] = _reload_options(entry)
     email = entry.data.get(CONF_EMAIL)
 
-    client = TorqueReceiveDataView(hass.data[DOMAIN][entry.entry_id]["data"], email, False)
+    client = TorqueReceiveDataView(
+        hass.data[DOMAIN][entry.entry_id]["data"], email, _imperial(entry),
+        entry.options.get(CONF_PUBLISH_INTERVAL, DEFAULT_PUBLISH_INTERVAL))
     coordinator = TorqueLoggerCoordinator(hass, client, entry)
     client.coordinator = coordinator
 
     hass.data[DOMAIN][entry.entry_id]["coordinator"] = coordinator
+    entry.async_on_unload(coordinator.async_cancel_discovery)
+    entry.async_on_unload(coordinator.async_cancel_flush)
 
-    hass.http.register_view(client)
+    entry.async_on_unload(
+        async_track_time_interval(
+            hass, client.data.async_sweep, SESSION_SWEEP_INTERVAL
+        )
+    )
 
     # Use async_forward_entry_setups instead of async_forward_entry_setup
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    entry.async_create_background_task(
+        hass, client.async_run_ingest(), f"{DOMAIN} ingest {entry.entry_id}")
+
     entry.async_on_unload(entry.add_update_listener(async_reload_entry))
     return True
 
@@ -69,5 +103,18 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
 async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Reload config entry."""
-    await async_unload_entry(hass, entry)
-    await async_setup_entry(hass, entry)
+    entry_data = hass.data[DOMAIN].get(entry.entry_id)
+    if entry_data is not None and entry_data["options"] == _reload_options(entry):
+        # Only the unit system changed, no need to set everything up again
+        entry_data["coordinator"].api.set_imperial(_imperial(entry))
+        return
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
+def _imperial(entry: ConfigEntry) -> bool:
+    return entry.options.get(CONF_IMPERIAL, entry.data.get(CONF_IMPERIAL, False))
+
+
+def _reload_options(entry: ConfigEntry) -> dict:
+    """Return the options that require a reload when changed."""
+    return {key: value for key, value in entry.options.items() if key != CONF_IMPERIAL}
@@ -1,16 +1,23 @@
 """Torque Logger API Client/DataView."""
-from typing import TYPE_CHECKING
+from functools import lru_cache
+from http import HTTPStatus
+import asyncio
+from typing import TYPE_CHECKING, Optional
 import logging
-import pint
+import re
+import time
 from homeassistant.components.http import HomeAssistantView
-from homeassistant.core import callback
+from homeassistant.core import HomeAssistant
 from homeassistant.util import slugify
 
-# Add these imports to handle potential NumPy issues
-import numpy as np
-np.cumproduct = np.cumprod  # Patch the deprecated function
-
-from .const import TORQUE_GPS_ACCURACY, TORQUE_GPS_ALTITUDE, TORQUE_GPS_LAT, TORQUE_GPS_LON, TORQUE_CODES
+from .const import (DEFAULT_PRECISION, DEFAULT_PRECISIONS, DOMAIN, INGEST_QUEUE_SIZE,
+    MAX_UNKNOWN_KEYS)
+from . import catalogue
+from .derived import DerivedMetrics
+from .metrics import IngestMetrics
+from .session import TorqueSessionStore
+from .throttle import PublishThrottle
+from .units import IMPERIAL_UNITS, get_converter, load_registry, registry_needed
 
 if TYPE_CHECKING:
     from .coordinator import TorqueLoggerCoordinator
@@ -18,123 +25,145 @@ if TYPE_CHECKING:
 TIMEOUT = 10
 _LOGGER: logging.Logger = logging.getLogger(__package__)
 
-ureg = pint.UnitRegistry()
+# Every query key is classified by one match of this pattern; the first
+# alternative that matches wins, like the old chain of startswith checks.
+_FIELD_PATTERN = re.compile(
+    r"(?P<prefix>userUnit|userShortName|userFullName|defaultUnit|k|profile)"
+    r"(?P<item>.*)",
+    re.DOTALL,
+)
+_PREFIX_SECTIONS = {
+    "userUnit": None,
+    "userShortName": "shortName",
+    "userFullName": "fullName",
+    "defaultUnit": "defaultUnit",
+    "k": "value",
+    "profile": "profile",
+}
+_EXACT_FIELDS = {
+    "eml": ("profile", "email"),
+    "time": ("time", None),
+    "v": ("profile", "version"),
+    "session": (None, None),
+    "id": ("profile", "id"),
+}
 
-imperalUnits = {"km": "mi", "°C": "°F", "km/h": "mph", "m": "ft"}
 
-prettyPint = {
-    "degC": "°C",
-    "degF": "°F",
-    "mile / hour": "mph",
-    "kilometer / hour": "km/h",
-    "mile": "mi",
-    "kilometer": "km",
-    "meter": "m",
-    "foot": "ft",
-}
+@lru_cache(maxsize=4096)
+def _classify_field(key: str):
+    """Return the (section, item) a Torque query key is stored under.
 
-# Generate the dictionaries from TORQUE_CODES
-assumedUnits = {}
-assumedShortName = {}
-assumedFullName = {}
-
-# Initialize with existing values
-assumedUnits = {
-    "04": "%",
-    "05": "°C",
-    "0c": "rpm",
-    "0d": "km/h",
-    "0f": "°C",
-    "11": "%",
-    "1f": "km",
-    "21": "km",
-    "2f": "%",
-    "31": "km",
-    "ff1001": "km/h",
-    "ff1006": "°",
-    "ff1005": "°",
-    "ff1239": "m",
-    "ff1010": "m",
-    "ff1007": "°",
-    "ff123a": "",
-    "ff1237": "km/h"
-}
+    A section of None means the key is ignored. Torque sends the same
+    key names on every upload, so results are cached.
+    """
+    match = _FIELD_PATTERN.match(key)
+    if match is None:
+        return _EXACT_FIELDS.get(key, ("unknown", None))
+    section = _PREFIX_SECTIONS[match.group("prefix")]
+    if section is None:
+        return None, None
+    item = match.group("item")
+    if section == "value" and len(item) == 1:
+        item = "0" + item
+    return section, item
 
-assumedShortName = {
-    "04": "engine_load",
-    "05": "coolant_temp",
-    "0c": "engine_rpm",
-    "0d": "speed",
-    "0f": "intake_temp",
-    "11": "throttle_pos",
-    "1f": "run_since_start",
-    "21": "dis_mil_on",
-    "2f": "fuel",
-    "31": "dis_mil_off",
-    "ff1001": "gps_spd",
-    "ff1006": TORQUE_GPS_LAT,
-    "ff1005": TORQUE_GPS_LON,
-    "ff1239": TORQUE_GPS_ACCURACY,
-    "ff1010": TORQUE_GPS_ALTITUDE,
-    "ff1007": "gps_brng",
-    "ff123a": "gps_sat",
-    "ff1237": "spd_diff"
-}
 
-assumedFullName = {
-    "04": "Engine Load",
-    "05": "Coolant Temperature",
-    "0c": "Engine RPM",
-    "0d": "Vehicle Speed",
-    "0f": "Intake Air Temperature",
-    "11": "Throttle Position",
-    "1f": "Distance Since Engine Start",
-    "21": "Distance with MIL on",
-    "2f": "Fuel Level",
-    "31": "Distance with MIL off",
-    "ff1001": "Vehicle Speed (GPS)",
-    "ff1006": "GPS Latitude",
-    "ff1005": "GPS Longitude",
-    "ff1239": "GPS Accuracy",
-    "ff1010": "GPS Altitude",
-    "ff1007": "GPS Bearing",
-    "ff123a": "GPS Satellites",
-    "ff1237": "GPS vs OBD Speed difference"
-}
+def client_for_email(hass: HomeAssistant, email: str) -> Optional['TorqueReceiveDataView']:
+    """Return the client of the loaded config entry Torque uploads to as email."""
+    if not email:
+        return None
+    for entry_data in hass.data.get(DOMAIN, {}).values():
+        coordinator = entry_data.get("coordinator")
+        if coordinator is not None and coordinator.api.email == email:
+            return coordinator.api
+    return None
 
-# Update from TORQUE_CODES to add all additional sensors
-for code, data in TORQUE_CODES.items():
-    if "unit" in data and data["unit"]:
-        assumedUnits[code] = data["unit"]
-    if "shortName" in data:
-        assumedShortName[code] = data["shortName"]
-    if "fullName" in data:
-        assumedFullName[code] = data["fullName"]
 
-class TorqueReceiveDataView(HomeAssistantView):
-    """Handle data from Torque requests."""
+class TorqueDataView(HomeAssistantView):
+    """Pass Torque uploads on to the client of their config entry.
+
+    The view is registered once; the client is looked up on every
+    request, so an entry reloaded with new options serves the next one.
+    """
 
     url = "/api/torque_logger"
     name = "api:torque_logger"
+
+    def __init__(self, hass: HomeAssistant):
+        """Initialize a Torque view."""
+        self.hass = hass
+
+    async def get(self, request):
+        """Handle Torque data GET request."""
+        client = client_for_email(self.hass, request.query.get("eml"))
+        if client is None:
+            return self.json_message("Not configured email", HTTPStatus.FORBIDDEN)
+        return await client.get(request)
+
+
+class TorqueReceiveDataView:
+    """Handle data from Torque requests.
+
+    Requests are answered as soon as their fields are parsed; the session
+    is then queued and published by a single consumer task, so slow
+    entity updates never delay Torque. A session already waiting in the
+    queue is not queued twice, its later changes are published with it.
+    """
+
     coordinator: 'TorqueLoggerCoordinator'
 
-    def __init__(self, data: dict, email: str, imperial: bool):
+    def __init__(self, data: TorqueSessionStore, email: str, imperial: bool,
+                 publish_interval: float = 0):
         """Initialize a Torque view."""
         self.data = data
         self.email = email
         self.imperial = imperial
-        self.email = email
+        self.throttle = PublishThrottle(publish_interval)
+        self.queue: asyncio.Queue[str] = asyncio.Queue(maxsize=INGEST_QUEUE_SIZE)
+        # session -> time its oldest unpublished upload was parsed
+        self._queued: dict[str, float] = {}
+        self.metrics = IngestMetrics()
+        self.derived = DerivedMetrics()
+        self._units_task: asyncio.Task = None
 
-    @callback
     async def get(self, request):
         """Handle Torque data GET request."""
         # hass = request.app["hass"]
         _LOGGER.debug(request.query)
+        received = time.monotonic()
+        self.metrics.uploads += 1
         session = self.parse_fields(request.query)
         if session is not None:
-            await self._async_publish_data(session)
+            self._enqueue(session, received)
         return "OK!"
 
+    def _enqueue(self, session: str, received: float) -> None:
+        if session in self._queued:
+            return
+        try:
+            self.queue.put_nowait(session)
+        except asyncio.QueueFull:
+            # The data stays in the session and goes out with its next upload
+            self.metrics.dropped += 1
+            _LOGGER.warning("Torque ingest queue is full, %d uploads dropped",
+                            self.metrics.dropped)
+            return
+        self._queued[session] = received
+
+    async def async_run_ingest(self) -> None:
+        """Publish queued sessions until cancelled."""
+        while True:
+            session = await self.queue.get()
+            received = self._queued.pop(session)
+            try:
+                if session in self.data:
+                    await self._async_publish_data(session)
+                    self.metrics.latencies.append(time.monotonic() - received)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error publishing Torque data")
+            finally:
+                self.queue.task_done()
+
     def parse_fields(self, qdata):  # noqa
         """Handle Torque data request."""
 
@@ -142,86 +171,98 @@ class TorqueReceiveDataView(HomeAssistantView):
         if session is None:
             raise Exception("No Session")
 
-        if session not in self.data:
-            self.data[session] = {
-                "profile": {},
-                "unit": {},
-                "defaultUnit": {},
-                "fullName": {},
-                "shortName": {},
-                "value": {},
-                "unknown": [],
-                "time": 0,
-            }
+        data = self.data.touch(session)
 
         for key, value in qdata.items():
-            if key.startswith("userUnit"):
-                continue
-            if key.startswith("userShortName"):
-                item = key[13:]
-                self.data[session]["shortName"][item] = value
-                continue
-            if key.startswith("userFullName"):
-                item = key[12:]
-                self.data[session]["fullName"][item] = value
-                continue
-            if key.startswith("defaultUnit"):
-                item = key[11:]
-                self.data[session]["defaultUnit"][item] = value
-                continue
-            if key.startswith("k"):
-                item = key[1:]
-                if len(item) == 1:
-                    item = "0" + item
-                self.data[session]["value"][item] = value
-                continue
-            if key.startswith("profile"):
-                item = key[7:]
-                self.data[session]["profile"][item] = value
-                continue
-            if key == "eml":
-                self.data[session]["profile"]["email"] = value
+            section, item = _classify_field(key)
+            if section == "value":
+                # Values are parsed once here, entities read them as floats
+                try:
+                    number = float(value)
+                except ValueError:
+                    _LOGGER.debug("Ignoring non-numeric value %s=%s", key, value)
+                    continue
+                data["received"].add(item)
+                if data["value"].get(item) != number:
+                    data["value"][item] = number
+                    data["changed"].add(item)
+            elif section is None:
                 continue
-            if key == "time":
-                self.data[session]["time"] = value
-                continue
-            if key == "v":
-                self.data[session]["profile"]["version"] = value
-                continue
-            if key == "session":
-                continue
-            if key == "id":
-                self.data[session]["profile"]["id"] = value
-                continue
-
-            self.data[session]["unknown"].append({"key": key, "value": value})
-
-        if (self.data[session]["profile"]["email"] == self.email
-        and self.data[session]["profile"]["email"] != ""):
+            elif section == "time":
+                data["time"] = value
+            elif section == "unknown":
+                self.metrics.unknown_keys += 1
+                unknown = data["unknown"].get(key)
+                if unknown is not None:
+                    unknown["count"] += 1
+                    unknown["value"] = value
+                elif len(data["unknown"]) < MAX_UNKNOWN_KEYS:
+                    data["unknown"][key] = {"count": 1, "value": value}
+            else:
+                data[section][item] = value
+                if section != "profile" and item in data["fields"]:
+                    # New metadata for this PID, resolve and publish it again
+                    del data["fields"][item]
+                    data["changed"].add(item)
+
+        profile = data["profile"]
+        if "id" in profile and "Name" in profile:
+            self.data.remember_name(profile["id"], profile["Name"])
+
+        if (profile.get("email") == self.email
+        and profile.get("email") != ""):
             return session
         raise Exception("Not configured email")
 
+    def set_imperial(self, imperial: bool) -> None:
+        """Switch the unit system and republish every PID in it."""
+        self.imperial = imperial
+        for data in self.data.values():
+            data["fields"].clear()
+            data["changed"].update(data["value"])
+
+    async def _async_load_units(self) -> None:
+        """Load the pint registry and resolve every PID again with it."""
+        await self.coordinator.hass.async_add_executor_job(load_registry)
+        self.set_imperial(self.imperial)
+
     def _get_field(self, session: str, key: str):
-        name: str = self.data[session]["fullName"].get(key, assumedFullName.get(key, key))
-        short_name: str = self.data[session]["shortName"].get(key, assumedShortName.get(key, key))
-        unit: str = self.data[session]["defaultUnit"].get(key, assumedUnits.get(key, ""))
-        value = self.data[session]["value"].get(key)
+        """Return the cached (short_name, meta, scale, offset) of a PID."""
+        fields = self.data[session]["fields"]
+        field = fields.get(key)
+        if field is None:
+            field = fields[key] = self._resolve_field(session, key)
+            # New PID or metadata, look for entities to create
+            self.data[session]["discover"] = True
+        return field
+
+    def _resolve_field(self, session: str, key: str):
+        record = catalogue.get_record(key)
+        if record is None:
+            record = catalogue.PidRecord(key, key, "")
+        name: str = self.data[session]["fullName"].get(key, record.full_name)
+        short_name: str = self.data[session]["shortName"].get(key, record.short_name)
+        unit: str = self.data[session]["defaultUnit"].get(key, record.unit)
+        scale = offset = None
 
         short_name = slugify(str(short_name))
 
-        if self.imperial is True:
-            if unit in imperalUnits:
-                conv = _pretty_convert_units(float(value), unit, imperalUnits[unit])
-                value = conv["value"]
-                unit = conv["unit"]
+        if self.imperial is True and unit in IMPERIAL_UNITS:
+            converter = get_converter(unit, IMPERIAL_UNITS[unit])
+            if converter is not None:
+                scale, offset = converter
+                unit = IMPERIAL_UNITS[unit]
+
+        precision = record.precision
+        if precision is None:
+            precision = DEFAULT_PRECISIONS.get(unit, DEFAULT_PRECISION)
 
-        return {
+        meta = {
             "name": name,
-            "short_name": short_name,
             "unit": unit,
-            "value": value,
+            "precision": precision,
         }
-
+        return short_name, meta, scale, offset
 
     def _get_profile(self, session: str):
         return self.data[session]["profile"]
@@ -231,16 +272,23 @@ class TorqueReceiveDataView(HomeAssistantView):
         retdata["profile"] = self._get_profile(session)
         retdata["time"] = self.data[session]["time"]
         meta = {}
-
-        for key, _ in self.data[session]["value"].items():
-            row_data = self._get_field(session, key)
-            retdata[row_data["short_name"]] = row_data["value"]
-            meta[row_data["short_name"]] = {
-                "name": row_data["name"],
-                "unit": row_data["unit"],
-            }
+        changed = set()
+        received = set()
+
+        # Conversion factors are resolved with the field, so converting
+        # the whole upload is one multiply-add per converted PID
+        for key, value in self.data[session]["value"].items():
+            short_name, field_meta, scale, offset = self._get_field(session, key)
+            retdata[short_name] = value if scale is None else value * scale + offset
+            meta[short_name] = field_meta
+            if key in self.data[session]["changed"]:
+                changed.add(short_name)
+            if key in self.data[session]["received"]:
+                received.add(short_name)
 
         retdata["meta"] = meta
+        retdata["changed"] = changed
+        retdata["received"] = received
 
         return retdata
 
@@ -251,46 +299,29 @@ class TorqueReceiveDataView(HomeAssistantView):
         # phones pushing data on the same car, and ids would differ.
         if "Name" not in session_data["profile"]:
             # do we have another session with the same profile id?
-            current_id = session_data["profile"]["id"]
-            other_sessions = [
-                self.data[key]
-                for key in self.data.keys()
-                if self.data[key]["profile"]["id"] == current_id and "Name" in self.data[key]["profile"]]
-            if len(other_sessions) == 0:
+            name = self.data.car_name(session_data["profile"].get("id"))
+            if name is None:
                 _LOGGER.error("Missing profile name from torque data.")
                 return
-            else:
-                session_data["profile"]["Name"] = other_sessions[0]["profile"]["Name"]
-        if (self.coordinator is None or self.coordinator.async_set_updated_data is None):
+            session_data["profile"]["Name"] = name
+        if self.coordinator is None:
             raise Exception("Invalid coordinator state")
 
-        self.coordinator.async_set_updated_data(session_data)
-        await self.coordinator.add_entities(session_data)
-
-
-def _pretty_units(unit):
-    if unit in prettyPint:
-        return prettyPint[unit]
-
-    return unit
-
-
-def _unpretty_units(unit):
-    for pint_unit, pretty_unit in prettyPint.items():
-        if pretty_unit == unit:
-            return pint_unit
-
-    return unit
-
-
-def _convert_units(value, u_in, u_out):
-    q_in = ureg.Quantity(value, u_in)
-    q_out = q_in.to(u_out)
-    return {"value": q_out.magnitude, "unit": str(q_out.units)}
-
-
-def _pretty_convert_units(value, u_in, u_out):
-    p_in = _unpretty_units(u_in)
-    p_out = _unpretty_units(u_out)
-    res = _convert_units(value, p_in, p_out)
-    return {"value": res["value"], "unit": _pretty_units(res["unit"])}
+        # Only entities whose value moved are woken up, and fast uploads
+        # are coalesced so each of them is written at a limited rate
+        self.data[session]["changed"].clear()
+        car_id = slugify(session_data["profile"]["Name"])
+        if self.derived.update(car_id, self.data[session], session_data, self.imperial):
+            self.data[session]["discover"] = True
+        self.data[session]["received"].clear()
+        session_data["changed"] = self.throttle.filter(car_id, session_data)
+        self.coordinator.async_update_car(car_id, session_data)
+        if self.data[session]["discover"]:
+            await self.coordinator.add_entities(session_data)
+            self.data[session]["discover"] = False
+
+        # Most setups never convert a pair pint is needed for, so it is
+        # only loaded, off the loop, the first time one shows up
+        if registry_needed() and self._units_task is None:
+            self._units_task = self.coordinator.hass.async_create_task(
+                self._async_load_units())
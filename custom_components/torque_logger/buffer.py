@@ -0,0 +1,106 @@
+"""Torque Logger in-memory sample history."""
+from array import array
+from bisect import bisect_left
+import math
+import time
+
+_NAN = math.nan
+
+
+def sample_time(session_data: dict) -> float:
+    """Return the timestamp of an upload in seconds."""
+    try:
+        # Torque sends the time of the sample in milliseconds
+        timestamp = float(session_data["time"]) / 1000
+    except (KeyError, TypeError, ValueError):
+        timestamp = 0
+    return timestamp or time.time()
+
+
+class SampleBuffer:
+    """Ring buffer of the most recent samples of one car.
+
+    Every PID has its own preallocated column of doubles, aligned with a
+    shared column of timestamps, so memory is bounded by ``size`` times
+    the number of PIDs and nothing is allocated per sample. PIDs missing
+    from a sample read as NaN. Reads return memoryviews of the columns,
+    in time order, without copying them; a window spanning the end of the
+    ring comes back as two segments.
+    """
+
+    def __init__(self, size: int) -> None:
+        """Initialize."""
+        self.size = size
+        self.times = array("d", [_NAN]) * size
+        self.columns: dict[str, array] = {}
+        # Index of the slot the next sample is written to
+        self._next = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        """Return the number of samples held."""
+        return self._count
+
+    @property
+    def latest_time(self) -> float:
+        """Return the timestamp of the newest sample, NaN when empty."""
+        return self.times[self._next - 1] if self._count else _NAN
+
+    def append(self, timestamp: float, values: dict[str, float]) -> bool:
+        """Add a sample, overwriting the oldest one once the ring is full.
+
+        Samples not newer than the latest one are ignored, e.g. when two
+        phones upload the same car. Return whether it was added.
+        """
+        if self._count and timestamp <= self.latest_time:
+            return False
+        index = self._next
+        self.times[index] = timestamp
+        for key, column in self.columns.items():
+            column[index] = values.get(key, _NAN)
+        for key in values.keys() - self.columns.keys():
+            column = self.columns[key] = array("d", [_NAN]) * self.size
+            column[index] = values[key]
+        self._next = (index + 1) % self.size
+        self._count = min(self._count + 1, self.size)
+        return True
+
+    def _segments(self, column: array) -> list[memoryview]:
+        view = memoryview(column)
+        start = self._next - self._count
+        if start >= 0:
+            return [view[start:self._next]]
+        return [view[start + self.size:], view[:self._next]]
+
+    def _starts(self, seconds: float) -> list[int]:
+        """Return where each segment enters the window of the last seconds."""
+        segments = self._segments(self.times)
+        if seconds is None:
+            return [0] * len(segments)
+        since = self.latest_time - seconds
+        return [bisect_left(segment, since) for segment in segments]
+
+    def window(self, key: str, seconds: float = None) -> list[memoryview]:
+        """Return the samples of a PID of the last seconds, oldest first.
+
+        Without seconds every held sample is returned. Unknown PIDs
+        return no segments.
+        """
+        column = self.columns.get(key)
+        if column is None or not self._count:
+            return []
+        return [
+            segment[start:]
+            for segment, start in zip(self._segments(column), self._starts(seconds))
+            if start < len(segment)
+        ]
+
+    def time_window(self, seconds: float = None) -> list[memoryview]:
+        """Return the timestamps of the samples window() returns."""
+        if not self._count:
+            return []
+        return [
+            segment[start:]
+            for segment, start in zip(self._segments(self.times), self._starts(seconds))
+            if start < len(segment)
+        ]
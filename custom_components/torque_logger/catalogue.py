@@ -0,0 +1,43 @@
+"""Catalogue of the Torque PIDs known to Torque Logger."""
+import json
+import os
+from typing import NamedTuple, Optional
+
+from .const import TORQUE_CODES_FILE
+
+
+class PidRecord(NamedTuple):
+    """Assumed names and unit of a PID when Torque sends none."""
+
+    short_name: str
+    full_name: str
+    unit: str
+    # Decimals of the sensor state, None for the default of the unit
+    precision: Optional[int] = None
+
+
+_records: dict[str, PidRecord] = {}
+_codes_by_name: dict[str, str] = {}
+
+
+def load() -> dict[str, PidRecord]:
+    """Read the catalogue file once, it does blocking I/O."""
+    if not _records:
+        path = os.path.join(os.path.dirname(__file__), TORQUE_CODES_FILE)
+        with open(path, encoding="utf-8") as file:
+            rows = json.load(file)
+        _records.update((code, PidRecord(*row)) for code, row in rows.items())
+    return _records
+
+
+def get_record(code: str) -> Optional[PidRecord]:
+    """Return the record of a PID code, or None for unknown PIDs."""
+    return load().get(code)
+
+
+def code_for_name(full_name: str) -> Optional[str]:
+    """Return the code of a PID from its full name, ignoring case."""
+    if not _codes_by_name:
+        _codes_by_name.update(
+            (record.full_name.lower(), code) for code, record in load().items())
+    return _codes_by_name.get(full_name.lower())
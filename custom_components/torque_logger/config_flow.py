@@ -4,8 +4,16 @@ from homeassistant.core import callback
 import voluptuous as vol
 
 from .const import (
+    CONF_BUFFER_SIZE,
     CONF_EMAIL,
     CONF_IMPERIAL,
+    CONF_MAX_SESSIONS,
+    CONF_PUBLISH_INTERVAL,
+    CONF_SESSION_TTL,
+    DEFAULT_BUFFER_SIZE,
+    DEFAULT_MAX_SESSIONS,
+    DEFAULT_PUBLISH_INTERVAL,
+    DEFAULT_SESSION_TTL,
     DOMAIN,
     PLATFORMS,
 )
@@ -88,10 +96,43 @@ class TorqueLoggerOptionsFlowHandler(config_entries.OptionsFlow):
             step_id="user",
             data_schema=vol.Schema(
                 {
+                    **{
+                        vol.Required(
+                            x, default=self.config_entry.options.get(x, True)
+                        ): bool
+                        for x in sorted(PLATFORMS)
+                    },
                     vol.Required(
-                        x, default=self.config_entry.options.get(x, True)
-                    ): bool
-                    for x in sorted(PLATFORMS)
+                        CONF_IMPERIAL,
+                        default=self.config_entry.options.get(
+                            CONF_IMPERIAL,
+                            self.config_entry.data.get(CONF_IMPERIAL, False),
+                        ),
+                    ): bool,
+                    vol.Required(
+                        CONF_MAX_SESSIONS,
+                        default=self.config_entry.options.get(
+                            CONF_MAX_SESSIONS, DEFAULT_MAX_SESSIONS
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                    vol.Required(
+                        CONF_SESSION_TTL,
+                        default=self.config_entry.options.get(
+                            CONF_SESSION_TTL, DEFAULT_SESSION_TTL
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=60)),
+                    vol.Required(
+                        CONF_PUBLISH_INTERVAL,
+                        default=self.config_entry.options.get(
+                            CONF_PUBLISH_INTERVAL, DEFAULT_PUBLISH_INTERVAL
+                        ),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                    vol.Required(
+                        CONF_BUFFER_SIZE,
+                        default=self.config_entry.options.get(
+                            CONF_BUFFER_SIZE, DEFAULT_BUFFER_SIZE
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=100000)),
                 }
             ),
         )
@@ -1,29 +1,55 @@
 """Torque Logger Coordinator."""
+from functools import partial
 import logging
 from typing import TYPE_CHECKING
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HassJob, HomeAssistant, callback
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.util import slugify
 
+from .buffer import SampleBuffer, sample_time
 from .sensor import TorqueSensor
 from .device_tracker import TorqueDeviceTracker
-from .const import DOMAIN, ENTITY_GPS
+from .const import (CONF_BUFFER_SIZE, DEFAULT_BUFFER_SIZE, DISCOVERY_DEBOUNCE, DOMAIN,
+    ENTITY_GPS, TORQUE_GPS_ACCURACY, TORQUE_GPS_LAT, TORQUE_GPS_LON)
 
 if TYPE_CHECKING:
     from .api import TorqueReceiveDataView
 
 _LOGGER: logging.Logger = logging.getLogger(__package__)
 
+GPS_KEYS = frozenset({TORQUE_GPS_LAT, TORQUE_GPS_LON, TORQUE_GPS_ACCURACY})
+
+
 class TorqueLoggerCoordinator(DataUpdateCoordinator):
-    """Class to manage fetching data from the API."""
+    """Class to manage fetching data from the API.
+
+    Updates are not broadcast to every listener; entities subscribe to
+    their own (car_id, sensor_key) and are only called when that key
+    changed in an upload of that car. The latest data of each car is
+    kept apart in ``cars`` so interleaved uploads do not mix values.
+
+    Torque reports the PIDs of a car that just connected over several
+    uploads, so new entities are collected per car and added in one
+    batch DISCOVERY_DEBOUNCE seconds after the first of them was found;
+    later ones do not push the batch back.
+
+    With CONF_BUFFER_SIZE set, the PIDs every upload of a car sent are
+    kept in a SampleBuffer of that many samples, for values derived from
+    their history; it is off by default.
+
+    Keys the publish throttle held back are dispatched by a timer at the
+    earliest time one of them is due, so they are written even when the
+    car stops uploading.
+    """
 
     async_add_sensor: AddEntitiesCallback
     async_add_device_tracker: AddEntitiesCallback
-    tracked: list[str] = list()
 
     def __init__(
         self,
@@ -35,6 +61,16 @@ class TorqueLoggerCoordinator(DataUpdateCoordinator):
         self.api = client
         self.entry = entry
         client.coordinator = self
+        self._key_listeners: dict[tuple[str, str], list[CALLBACK_TYPE]] = {}
+        self.cars: dict[str, dict] = {}
+        # (car_id, sensor_key) of every entity created or restored
+        self.tracked: set[tuple[str, str]] = set()
+        self._pending_sensors: dict[str, list['TorqueSensor']] = {}
+        self._pending_trackers: dict[str, list['TorqueDeviceTracker']] = {}
+        self._discovery: dict[str, Debouncer] = {}
+        self.buffer_size: int = entry.options.get(CONF_BUFFER_SIZE, DEFAULT_BUFFER_SIZE)
+        self.buffers: dict[str, SampleBuffer] = {}
+        self._flush_timers: dict[str, CALLBACK_TYPE] = {}
 
         super().__init__(hass, _LOGGER, name=DOMAIN)
 
@@ -43,6 +79,77 @@ class TorqueLoggerCoordinator(DataUpdateCoordinator):
         _LOGGER.debug("No data update required")
         return None
 
+    @callback
+    def async_add_key_listener(
+        self, car_id: str, key: str, update_callback: CALLBACK_TYPE
+    ) -> CALLBACK_TYPE:
+        """Listen for changes of one key of one car."""
+        listeners = self._key_listeners.setdefault((car_id, key), [])
+        listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            listeners.remove(update_callback)
+            if not listeners:
+                self._key_listeners.pop((car_id, key), None)
+
+        return remove_listener
+
+    def car_data(self, car_id: str):
+        """Return the latest data of a car, if it has uploaded any."""
+        return self.cars.get(car_id)
+
+    @callback
+    def async_update_car(self, car_id: str, session_data: dict) -> None:
+        """Store an upload and call the listeners of the keys it changed."""
+        car = self.cars.setdefault(car_id, {"meta": {}})
+        meta = car["meta"]
+        car.update(session_data)
+        # Keep the metadata of keys only known from other sessions
+        meta.update(session_data["meta"])
+        car["meta"] = meta
+        self._buffer_sample(car_id, session_data)
+        self._async_dispatch(car_id, session_data["changed"])
+        self._async_schedule_flush(car_id)
+
+    @callback
+    def _async_dispatch(self, car_id: str, changed: set[str]) -> None:
+        """Call the listeners of the changed keys of a car."""
+        keys = changed | {ENTITY_GPS} if not GPS_KEYS.isdisjoint(changed) else changed
+        for key in keys:
+            for update_callback in self._key_listeners.get((car_id, key), ()):
+                update_callback()
+
+    @callback
+    def _async_schedule_flush(self, car_id: str) -> None:
+        """Wake up when the first key the throttle held back is due."""
+        cancel = self._flush_timers.pop(car_id, None)
+        if cancel is not None:
+            cancel()
+        delay = self.api.throttle.next_flush(car_id)
+        if delay is not None:
+            self._flush_timers[car_id] = async_call_later(
+                self.hass, delay,
+                HassJob(partial(self._async_flush, car_id), cancel_on_shutdown=True))
+
+    @callback
+    def _async_flush(self, car_id: str, _now) -> None:
+        """Dispatch the held back keys of a car that are due."""
+        self._flush_timers.pop(car_id, None)
+        self._async_dispatch(
+            car_id, self.api.throttle.flush(car_id, self.cars[car_id]["meta"]))
+        self._async_schedule_flush(car_id)
+
+    def _buffer_sample(self, car_id: str, session_data: dict) -> None:
+        """Append the PIDs sent with an upload to the history of its car."""
+        if not self.buffer_size:
+            return
+        buffer = self.buffers.get(car_id)
+        if buffer is None:
+            buffer = self.buffers[car_id] = SampleBuffer(self.buffer_size)
+        buffer.append(sample_time(session_data),
+                      {key: session_data[key] for key in session_data["received"]})
+
     async def add_entities(self, session_data: dict):
         """Add not tracked entities"""
         car_id = slugify(session_data["profile"]["Name"])
@@ -59,27 +166,66 @@ class TorqueLoggerCoordinator(DataUpdateCoordinator):
         new_trackers: list['TorqueDeviceTracker'] = []
         
         for key, value in session_data["meta"].items():
+            if (car_id, key) in self.tracked:
+                continue
             sensor_name = value.get("name")
             unit = value.get("unit", "").strip()
             if (sensor_name and sensor_name != key and 
                 len(unit) > 0 and 
-                key[:3] != ENTITY_GPS and 
-                key not in self.tracked):
+                key[:3] != ENTITY_GPS):
                 # do not publish until we have sensor name and unit
                 sensor = TorqueSensor(self, self.entry, key, device)
                 new_sensors.append(sensor)
 
-        if "gpslat" in session_data and "gpslon" in session_data and ENTITY_GPS not in self.tracked:
+        if "gpslat" in session_data and "gpslon" in session_data and (car_id, ENTITY_GPS) not in self.tracked:
             tracker = TorqueDeviceTracker(self, self.entry, device)
             new_trackers.append(tracker)
         
+        if not new_sensors and not new_trackers:
+            return
+
+        self.tracked.update((car_id, sensor.sensor_key) for sensor in new_sensors)
+        self.tracked.update((car_id, tracker.sensor_key) for tracker in new_trackers)
+        self._pending_sensors.setdefault(car_id, []).extend(new_sensors)
+        self._pending_trackers.setdefault(car_id, []).extend(new_trackers)
+
+        if car_id not in self._discovery:
+            self._discovery[car_id] = Debouncer(
+                self.hass,
+                _LOGGER,
+                cooldown=DISCOVERY_DEBOUNCE,
+                immediate=False,
+                function=partial(self._async_add_pending, car_id),
+            )
+        await self._discovery[car_id].async_call()
+
+    @callback
+    def _async_add_pending(self, car_id: str) -> None:
+        """Add the entities discovered for a car in one batch."""
+        new_sensors = self._pending_sensors.pop(car_id, [])
+        new_trackers = self._pending_trackers.pop(car_id, [])
+
         if new_sensors:
-            self.tracked.extend(sensor.sensor_key for sensor in new_sensors)
             self.async_add_sensor(new_sensors)
-        
+
         if new_trackers:
-            self.tracked.extend(tracker.sensor_key for tracker in new_trackers)
             self.async_add_device_tracker(new_trackers)
-        
-        _LOGGER.debug("Tracked entities: %s", ", ".join(self.tracked))
 
+        _LOGGER.debug("Added %d entities for %s, tracked entities: %d",
+                      len(new_sensors) + len(new_trackers), car_id, len(self.tracked))
+
+    @callback
+    def async_cancel_discovery(self) -> None:
+        """Drop pending entity discovery, e.g. when the entry is unloaded."""
+        for debouncer in self._discovery.values():
+            debouncer.async_cancel()
+        self._discovery.clear()
+        self._pending_sensors.clear()
+        self._pending_trackers.clear()
+
+    @callback
+    def async_cancel_flush(self) -> None:
+        """Stop the throttle timers, e.g. when the entry is unloaded."""
+        for cancel in self._flush_timers.values():
+            cancel()
+        self._flush_timers.clear()
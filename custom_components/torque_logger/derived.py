@@ -0,0 +1,226 @@
+"""Torque Logger metrics derived from the uploaded PIDs."""
+from collections import deque
+
+from .buffer import sample_time
+from .const import (DEFAULT_PRECISION, DEFAULT_PRECISIONS, DERIVED_AVERAGE_WINDOW,
+    MAX_INTEGRATION_GAP, TRIP_TIMEOUT)
+from .units import IMPERIAL_UNITS, get_converter
+
+# PID codes the metrics are computed from, the first one sent is used,
+# with the unit assumed when Torque sends none
+SPEED_PIDS = {"0d": "km/h", "ff1001": "km/h"}
+RPM_PIDS = {"0c": "rpm"}
+FUEL_FLOW_PIDS = {"ff125d": "L/hr", "ff125a": "cc/min"}
+
+# key: (name, metric unit)
+DERIVED_METRICS = {
+    "derived_avg_speed": ("Average Speed (last 5 min)", "km/h"),
+    "derived_trip_avg_speed": ("Trip Average Speed", "km/h"),
+    "derived_trip_min_speed": ("Trip Minimum Speed", "km/h"),
+    "derived_trip_max_speed": ("Trip Maximum Speed", "km/h"),
+    "derived_trip_min_rpm": ("Trip Minimum Engine RPM", "rpm"),
+    "derived_trip_max_rpm": ("Trip Maximum Engine RPM", "rpm"),
+    "derived_trip_distance": ("Trip Distance (Derived)", "km"),
+    "derived_trip_fuel_used": ("Trip Fuel Used", "l"),
+    "derived_trip_economy": ("Trip Fuel Economy", "l/100km"),
+}
+IMPERIAL_ECONOMY = "mpg"
+MIN_ECONOMY_DISTANCE = 1.0  # km
+
+
+def _elapsed(timestamp: float, last: tuple[float, float]):
+    """Return the seconds since the last sample of an input, None over a gap."""
+    if last is None:
+        return None
+    elapsed = timestamp - last[0]
+    # Too long without data to tell what happened in between
+    return elapsed if elapsed <= MAX_INTEGRATION_GAP else None
+
+
+class TripMetrics:
+    """Metrics of the current trip of one car, updated sample by sample.
+
+    Each sample costs constant work: the rolling average keeps a running
+    sum of the speeds in its window and evicts the expired ones, and
+    distance and fuel are integrated with the trapezoidal rule between
+    consecutive samples of each input, skipping gaps longer than
+    MAX_INTEGRATION_GAP. A trip starts over when the car has not
+    uploaded for TRIP_TIMEOUT seconds.
+    """
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self._reset()
+
+    def _reset(self) -> None:
+        self.start: float = None
+        self.distance = 0.0  # km
+        # Seconds the distance was integrated over, gaps excluded
+        self.distance_time = 0.0
+        self.fuel = 0.0  # l
+        self.min_speed: float = None
+        self.max_speed: float = None
+        self.min_rpm: float = None
+        self.max_rpm: float = None
+        self._last_time: float = None
+        # (timestamp, value) of the last sample of each integrated input
+        self._last_speed: tuple[float, float] = None
+        self._last_flow: tuple[float, float] = None
+        # (timestamp, km/h) of the speeds in the rolling window
+        self._speeds: deque[tuple[float, float]] = deque()
+        self._speed_sum = 0.0
+
+    def add(self, timestamp: float, speed: float = None, rpm: float = None,
+            fuel_flow: float = None) -> bool:
+        """Add a sample in km/h, rpm and L/hr. Return whether it was used."""
+        if self._last_time is not None:
+            if timestamp - self._last_time > TRIP_TIMEOUT:
+                self._reset()
+            elif timestamp <= self._last_time:
+                return False
+        if self.start is None:
+            self.start = timestamp
+
+        if speed is not None:
+            elapsed = _elapsed(timestamp, self._last_speed)
+            if elapsed is not None:
+                self.distance += (self._last_speed[1] + speed) / 2 * elapsed / 3600
+                self.distance_time += elapsed
+            self._last_speed = (timestamp, speed)
+            if self.min_speed is None or speed < self.min_speed:
+                self.min_speed = speed
+            if self.max_speed is None or speed > self.max_speed:
+                self.max_speed = speed
+            self._speeds.append((timestamp, speed))
+            self._speed_sum += speed
+        while self._speeds and self._speeds[0][0] < timestamp - DERIVED_AVERAGE_WINDOW:
+            self._speed_sum -= self._speeds.popleft()[1]
+
+        if fuel_flow is not None:
+            elapsed = _elapsed(timestamp, self._last_flow)
+            if elapsed is not None:
+                self.fuel += (self._last_flow[1] + fuel_flow) / 2 * elapsed / 3600
+            self._last_flow = (timestamp, fuel_flow)
+
+        if rpm is not None:
+            if self.min_rpm is None or rpm < self.min_rpm:
+                self.min_rpm = rpm
+            if self.max_rpm is None or rpm > self.max_rpm:
+                self.max_rpm = rpm
+
+        self._last_time = timestamp
+        return True
+
+    def values(self) -> dict[str, float]:
+        """Return the metrics that can be computed so far, in metric units."""
+        values = {}
+        if self._speeds:
+            values["derived_avg_speed"] = self._speed_sum / len(self._speeds)
+        if self.max_speed is not None:
+            values["derived_trip_min_speed"] = self.min_speed
+            values["derived_trip_max_speed"] = self.max_speed
+            values["derived_trip_distance"] = self.distance
+            if self.distance_time:
+                values["derived_trip_avg_speed"] = (
+                    self.distance / self.distance_time * 3600)
+        if self.max_rpm is not None:
+            values["derived_trip_min_rpm"] = self.min_rpm
+            values["derived_trip_max_rpm"] = self.max_rpm
+        if self._last_flow is not None:
+            values["derived_trip_fuel_used"] = self.fuel
+            # Economy over the first few hundred metres is meaningless
+            if self.distance >= MIN_ECONOMY_DISTANCE:
+                values["derived_trip_economy"] = self.fuel / self.distance * 100
+        return values
+
+
+def _read(session: dict, pids: dict[str, str], unit: str):
+    """Return the first of the PIDs an upload sent, converted to unit.
+
+    PIDs are looked up by code, as the short names they are published
+    under are whatever the user named them in Torque. The last-known
+    value of a PID that stopped reporting is never used.
+    """
+    for code, default_unit in pids.items():
+        if code not in session["received"]:
+            continue
+        value = session["value"].get(code)
+        if value is None:
+            continue
+        value_unit = session["defaultUnit"].get(code) or default_unit
+        if value_unit == unit:
+            return value
+        converter = get_converter(value_unit, unit)
+        if converter is not None:
+            return value * converter[0] + converter[1]
+    return None
+
+
+class DerivedMetrics:
+    """Add the metrics of every car's trip to its uploads.
+
+    The metrics are added to the session data as PIDs of their own, so
+    they are throttled, published and discovered as TorqueSensors like
+    the PIDs Torque sends.
+    """
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self._trips: dict[str, TripMetrics] = {}
+        # car_id -> {key: (value, unit)} of the metrics last published
+        self._last: dict[str, dict[str, tuple[float, str]]] = {}
+
+    def update(self, car_id: str, session: dict, session_data: dict,
+               imperial: bool) -> bool:
+        """Add the derived metrics of a session's upload to its session data.
+
+        Only metrics whose value or unit moved are marked changed. Return
+        True when a metric shows up for the first time, so that its
+        entity gets discovered.
+        """
+        trip = self._trips.get(car_id)
+        if trip is None:
+            trip = self._trips[car_id] = TripMetrics()
+        trip.add(
+            sample_time(session_data),
+            _read(session, SPEED_PIDS, "km/h"),
+            _read(session, RPM_PIDS, "rpm"),
+            _read(session, FUEL_FLOW_PIDS, "L/hr"),
+        )
+
+        values = trip.values()
+        if imperial:
+            values = self._to_imperial(values)
+        else:
+            values = {key: (value, DERIVED_METRICS[key][1]) for key, value in values.items()}
+        last = self._last.setdefault(car_id, {})
+        discovered = not last.keys() >= values.keys()
+        for key, (value, unit) in values.items():
+            session_data[key] = value
+            session_data["meta"][key] = {
+                "name": DERIVED_METRICS[key][0],
+                "unit": unit,
+                "precision": DEFAULT_PRECISIONS.get(unit, DEFAULT_PRECISION),
+            }
+            if last.get(key) != (value, unit):
+                last[key] = (value, unit)
+                session_data["changed"].add(key)
+        return discovered
+
+    @staticmethod
+    def _to_imperial(values: dict[str, float]) -> dict[str, tuple[float, str]]:
+        result = {}
+        for key, value in values.items():
+            unit = DERIVED_METRICS[key][1]
+            if key == "derived_trip_economy":
+                # Miles per gallon is the inverse of litres per 100 km
+                if value:
+                    result[key] = (235.214583 / value, IMPERIAL_ECONOMY)
+                continue
+            imperial_unit = IMPERIAL_UNITS.get(unit)
+            converter = get_converter(unit, imperial_unit) if imperial_unit else None
+            if converter is None:
+                result[key] = (value, unit)
+            else:
+                result[key] = (value * converter[0] + converter[1], imperial_unit)
+        return result
@@ -16,14 +16,14 @@ from homeassistant.const import (
 
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.restore_state import RestoreEntity
-from homeassistant.helpers import device_registry
+from homeassistant.helpers import device_registry, entity_registry
 
 from .entity import TorqueEntity
-from .const import (ATTR_ALTITUDE, DOMAIN, ENTITY_GPS, GPS_ICON,
+from .const import (DEVICE_TRACKER, DOMAIN, ENTITY_GPS, GPS_ICON,
      TORQUE_GPS_ACCURACY, TORQUE_GPS_LAT,
      TORQUE_GPS_LON)
 if TYPE_CHECKING:
@@ -38,17 +38,25 @@ async def async_setup_entry(
     coordinator: 'TorqueLoggerCoordinator' = hass.data[DOMAIN][entry.entry_id]["coordinator"]
     coordinator.async_add_device_tracker = async_add_entities
 
-    # Restore previously loaded trackers
+    # Restore previously loaded trackers, cars that never sent GPS have none
+    ent_reg = entity_registry.async_get(hass)
     dev_reg = device_registry.async_get(hass)
     devices = [
         device
-        for device in dev_reg.devices.values()
-        for identifier in device.identifiers
-        if identifier[0] == DOMAIN
+        for device in device_registry.async_entries_for_config_entry(
+            dev_reg, entry.entry_id)
+        if any(identifier[0] == DOMAIN and identifier[-1] == "car"
+               for identifier in device.identifiers)
     ]
     logmsg = f"{len(devices)} device_tracker to restore"
     _LOGGER.debug(logmsg)
     for device in devices:
+        if not any(
+            tracker.domain == DEVICE_TRACKER and tracker.config_entry_id == entry.entry_id
+            for tracker in entity_registry.async_entries_for_device(
+                ent_reg, device.id, include_disabled_entities=True)
+        ):
+            continue
         logmsg = f"Restoring {device.model} device_tracker"
         device_info = DeviceInfo(
             identifiers=device.identifiers,
@@ -58,6 +66,8 @@ async def async_setup_entry(
             sw_version=device.sw_version
         )
         _LOGGER.debug(logmsg)
+        car_id = list(device.identifiers)[0][1]
+        coordinator.tracked.add((car_id, ENTITY_GPS))
         async_add_entities([TorqueDeviceTracker(coordinator, entry, device_info)])
 
 class TorqueDeviceTracker(TorqueEntity, TrackerEntity, RestoreEntity):
@@ -68,7 +78,28 @@ class TorqueDeviceTracker(TorqueEntity, TrackerEntity, RestoreEntity):
         super().__init__(coordinator, config_entry, ENTITY_GPS, device)
         self._attr_name = self._car_name
         self._attr_icon = GPS_ICON
-        self._restored_state: dict = None
+        # Floats parsed at ingest, cached so reading a property is free
+        self._latitude: float = None
+        self._longitude: float = None
+        self._accuracy: float = None
+        self._update_location()
+
+    def _update_location(self) -> None:
+        car_data = self.coordinator.car_data(self._car_id)
+        if car_data is None:
+            return
+        if car_data.get(TORQUE_GPS_LAT) is not None:
+            self._latitude = car_data[TORQUE_GPS_LAT]
+        if car_data.get(TORQUE_GPS_LON) is not None:
+            self._longitude = car_data[TORQUE_GPS_LON]
+        if car_data.get(TORQUE_GPS_ACCURACY) is not None:
+            self._accuracy = car_data[TORQUE_GPS_ACCURACY]
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Cache the new location before the state is written."""
+        self._update_location()
+        super()._handle_coordinator_update()
 
     @property
     def battery_level(self):
@@ -78,30 +109,18 @@ class TorqueDeviceTracker(TorqueEntity, TrackerEntity, RestoreEntity):
     @property
     def location_accuracy(self):
         """Return the gps accuracy of the device."""
-        if self.coordinator.data is not None and TORQUE_GPS_ACCURACY in self.coordinator.data and self.coordinator.data[TORQUE_GPS_ACCURACY] is not None:
-            return float(self.coordinator.data[TORQUE_GPS_ACCURACY])
-        elif self._restored_state is not None and ATTR_GPS_ACCURACY in self._restored_state and self._restored_state[ATTR_GPS_ACCURACY] is not None:
-            return float(self._restored_state[ATTR_GPS_ACCURACY])
-        else:
-            return None
+        # Zones compare it to their radius, unknown has to be a number
+        return self._accuracy if self._accuracy is not None else 0
+
     @property
     def latitude(self):
         """Return latitude value of the device."""
-        if self.coordinator.data is not None and TORQUE_GPS_LAT in self.coordinator.data and self.coordinator.data[TORQUE_GPS_LAT] is not None:
-            return float(self.coordinator.data[TORQUE_GPS_LAT])
-        elif self._restored_state is not None and ATTR_LATITUDE in self._restored_state and self._restored_state[ATTR_LATITUDE] is not None:
-            return float(self._restored_state[ATTR_LATITUDE])
-        else:
-            return None
+        return self._latitude
+
     @property
     def longitude(self):
         """Return longitude value of the device."""
-        if self.coordinator.data is not None and TORQUE_GPS_LON in self.coordinator.data and self.coordinator.data[TORQUE_GPS_LON] is not None:
-            return float(self.coordinator.data[TORQUE_GPS_LON])
-        elif self._restored_state is not None and ATTR_LONGITUDE in self._restored_state and self._restored_state[ATTR_LONGITUDE] is not None:
-            return float(self._restored_state[ATTR_LONGITUDE])
-        else:
-            return None
+        return self._longitude
 
     @property
     def source_type(self):
@@ -111,6 +130,8 @@ class TorqueDeviceTracker(TorqueEntity, TrackerEntity, RestoreEntity):
     async def async_added_to_hass(self):
         """Call when entity about to be added to Home Assistant."""
         await super().async_added_to_hass()
+        # Pick up uploads received while discovery was debounced
+        self._update_location()
         state = await self.async_get_last_state()
         if state is None:
             _LOGGER.debug(f"No previous state for {self.entity_id}")
@@ -118,10 +139,10 @@ class TorqueDeviceTracker(TorqueEntity, TrackerEntity, RestoreEntity):
 
         attr = state.attributes
         _LOGGER.debug(f"Restored state for {self.entity_id}")
-        self._restored_state = {
-            ATTR_ALTITUDE: attr.get(ATTR_ALTITUDE),
-            ATTR_LATITUDE: attr.get(ATTR_LATITUDE),
-            ATTR_LONGITUDE: attr.get(ATTR_LONGITUDE),
-            ATTR_GPS_ACCURACY: attr.get(ATTR_GPS_ACCURACY)
-        }
-
+        # Data uploaded since startup is newer than the restored state
+        if self._latitude is None and attr.get(ATTR_LATITUDE) is not None:
+            self._latitude = float(attr[ATTR_LATITUDE])
+        if self._longitude is None and attr.get(ATTR_LONGITUDE) is not None:
+            self._longitude = float(attr[ATTR_LONGITUDE])
+        if self._accuracy is None and attr.get(ATTR_GPS_ACCURACY) is not None:
+            self._accuracy = float(attr[ATTR_GPS_ACCURACY])
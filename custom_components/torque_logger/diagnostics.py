@@ -0,0 +1,43 @@
+"""Diagnostics support for Torque Logger."""
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_EMAIL, DOMAIN
+
+TO_REDACT = {CONF_EMAIL, "id"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict:
+    """Return diagnostics for a config entry."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+    client = coordinator.api
+
+    return {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "metrics": {
+            "uploads": client.metrics.uploads,
+            "unknown_keys": client.metrics.unknown_keys,
+            "dropped_uploads": client.metrics.dropped,
+            "latency_ms": client.metrics.latency_summary(),
+            "queue_depth": client.queue.qsize(),
+        },
+        "cars": sorted(coordinator.cars),
+        "tracked_entities": len(coordinator.tracked),
+        "buffered_samples": {
+            car_id: len(buffer) for car_id, buffer in coordinator.buffers.items()
+        },
+        "sessions": [
+            {
+                "profile": async_redact_data(session["profile"], TO_REDACT),
+                "pids": len(session["value"]),
+                "unknown": session["unknown"],
+            }
+            for session in client.data.values()
+        ],
+    }
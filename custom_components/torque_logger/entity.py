@@ -1,7 +1,10 @@
 """Torque Entity class"""
 
 from typing import TYPE_CHECKING
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.helpers.update_coordinator import (
+    BaseCoordinatorEntity,
+    CoordinatorEntity,
+)
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.helpers.entity import DeviceInfo
 from .const import DOMAIN, ATTRIBUTION
@@ -24,3 +27,14 @@ class TorqueEntity(CoordinatorEntity):
         self._attr_extra_state_attributes = {
             "car": self._car_name
         }
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to updates of this entity's own car and key."""
+        # Skip the listener BaseCoordinatorEntity adds, it would wake every
+        # entity on each coordinator update
+        await super(BaseCoordinatorEntity, self).async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.async_add_key_listener(
+                self._car_id, self.sensor_key, self._handle_coordinator_update
+            )
+        )
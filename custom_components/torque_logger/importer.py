@@ -0,0 +1,319 @@
+"""Torque Logger CSV trip log import."""
+from datetime import datetime, timedelta
+from http import HTTPStatus
+import asyncio
+import csv
+import logging
+import os
+import re
+
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.core import HomeAssistant, ServiceCall, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_util, slugify
+import voluptuous as vol
+
+from . import catalogue
+from .api import client_for_email
+from .const import (ATTR_CAR, ATTR_FILENAME, DOMAIN, IMPORT_CHUNK_SIZE,
+    IMPORT_READ_SIZE, SERVICE_IMPORT_LOG)
+
+_LOGGER: logging.Logger = logging.getLogger(__package__)
+
+TIME_COLUMN = "Device Time"
+TIME_FORMAT = "%d-%b-%Y %H:%M:%S.%f"
+
+IMPORT_LOG_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_FILENAME): str,
+        vol.Required(ATTR_CAR): str,
+    }
+)
+
+# "Engine RPM(rpm)" -> ("Engine RPM", "rpm"), the suffix may not be a unit
+_HEADER_PATTERN = re.compile(r"^\s*(?P<name>.*?)\s*(?:\((?P<unit>[^()]*)\))?\s*$")
+
+# Units of the columns Torque writes, besides those of the PID catalogue;
+# any other parenthesised suffix, like the x of G(x), is part of the name
+CSV_UNITS = frozenset({
+    "%", "°", "°c", "°f", "bar", "cc/min", "ft", "g", "g/s", "gal", "hp", "kg/h",
+    "km", "km/h", "kpa", "kpl", "kw", "l", "l/100km", "l/hr", "m", "meters/second",
+    "mi", "min", "mpg", "mph", "ms", "nm", "psi", "rpm", "s", "v",
+})
+
+
+def _is_unit(unit: str) -> bool:
+    if unit.lower() in CSV_UNITS:
+        return True
+    return any(record.unit == unit for record in catalogue.load().values())
+
+
+def _parse_column(column: str):
+    """Return the (short_name, name, unit) of a Torque CSV column."""
+    match = _HEADER_PATTERN.match(column)
+    name = match.group("name")
+    unit = match.group("unit")
+    if unit is not None and not _is_unit(unit):
+        name, unit = column.strip(), None
+    code = catalogue.code_for_name(name)
+    if code is None:
+        return slugify(name), name, unit or ""
+    record = catalogue.get_record(code)
+    return (
+        slugify(record.short_name),
+        name,
+        unit if unit is not None else record.unit,
+    )
+
+
+class TorqueLogImporter:
+    """Aggregate the rows of a Torque CSV log into statistics.
+
+    Rows are expected in time order, as Torque writes them. Only the
+    statistics bucket being filled and the completed buckets not yet
+    popped are kept in memory, so logs of any size can be streamed.
+    Long-term statistics are hourly; the recorder purges shorter ones
+    with the rest of its history, so they are never imported.
+    """
+
+    def __init__(self, car_name: str, period: timedelta = timedelta(hours=1)) -> None:
+        """Initialize."""
+        self.car_id = slugify(car_name)
+        self.car_name = car_name
+        self.period = period
+        self.rows = 0
+        self._time_index = None
+        self._columns: list[tuple[int, str]] = []
+        # short_name -> (name, unit)
+        self._names: dict[str, tuple[str, str]] = {}
+        self._start: datetime = None
+        # short_name -> [min, max, total, count] of the current bucket
+        self._bucket: dict[str, list[float]] = {}
+        # short_name -> completed statistics rows
+        self._completed: dict[str, list[dict]] = {}
+        self.pending = 0
+
+    def add_header(self, header: list[str]) -> None:
+        """Map the columns of the log to statistics."""
+        header = [column.lstrip("\ufeff").strip() for column in header]
+        if TIME_COLUMN not in header:
+            raise ValueError(f"Missing {TIME_COLUMN} column")
+        self._time_index = header.index(TIME_COLUMN)
+        self._columns = []
+        used = set()
+        for index, column in enumerate(header):
+            if index == self._time_index or not column:
+                continue
+            short_name, name, unit = _parse_column(column)
+            # Columns never share a statistic, even when named alike
+            unique, count = short_name, 1
+            while unique in used:
+                count += 1
+                unique = f"{short_name}_{count}"
+            short_name = unique
+            used.add(short_name)
+            self._columns.append((index, short_name))
+            self._names.setdefault(short_name, (name, unit))
+
+    def add_row(self, row: list[str]) -> None:
+        """Add one row of the log, the first row being the header."""
+        if self._time_index is None:
+            self.add_header(row)
+            return
+        if len(row) <= self._time_index:
+            return
+        try:
+            when = datetime.strptime(row[self._time_index].strip(), TIME_FORMAT)
+        except ValueError:
+            # Torque repeats the header when a log is resumed
+            return
+        when = when.replace(tzinfo=dt_util.DEFAULT_TIME_ZONE)
+        start = self._bucket_start(when)
+        if start != self._start:
+            self._close_bucket()
+            self._start = start
+
+        self.rows += 1
+        for index, short_name in self._columns:
+            if index >= len(row):
+                continue
+            try:
+                value = float(row[index])
+            except ValueError:
+                # "-" marks PIDs without a reading in this row
+                continue
+            stats = self._bucket.get(short_name)
+            if stats is None:
+                self._bucket[short_name] = [value, value, value, 1]
+            else:
+                if value < stats[0]:
+                    stats[0] = value
+                if value > stats[1]:
+                    stats[1] = value
+                stats[2] += value
+                stats[3] += 1
+
+    def pop_statistics(self, final: bool = False) -> dict[str, list[dict]]:
+        """Return and forget the completed statistics of every column."""
+        if final:
+            self._close_bucket()
+        completed, self._completed = self._completed, {}
+        self.pending = 0
+        return completed
+
+    def metadata(self, short_name: str) -> dict:
+        """Return the statistics metadata of a column."""
+        name, unit = self._names.get(short_name, (short_name, None))
+        return {
+            "has_mean": True,
+            "has_sum": False,
+            "name": f"{self.car_name} {name}",
+            "source": DOMAIN,
+            "statistic_id": f"{DOMAIN}:{self.car_id}_{short_name}",
+            "unit_of_measurement": unit or None,
+        }
+
+    def _bucket_start(self, when: datetime) -> datetime:
+        timestamp = when.timestamp()
+        return dt_util.utc_from_timestamp(
+            timestamp - timestamp % self.period.total_seconds())
+
+    def _close_bucket(self) -> None:
+        for short_name, (low, high, total, count) in self._bucket.items():
+            self._completed.setdefault(short_name, []).append({
+                "start": self._start,
+                "mean": total / count,
+                "min": low,
+                "max": high,
+            })
+            self.pending += 1
+        self._bucket = {}
+
+
+async def async_add_statistics(hass: HomeAssistant, importer: TorqueLogImporter,
+                               statistics: dict[str, list[dict]]) -> int:
+    """Import statistics popped from an importer and wait until they are written.
+
+    The recorder only queues imports, waiting for it keeps a long log
+    from piling up in its queue faster than it is written.
+    """
+    # The recorder is optional, only imported when logs are
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.components.recorder import get_instance
+    from homeassistant.components.recorder.statistics import (
+        async_add_external_statistics,
+    )
+
+    count = 0
+    for short_name, rows in statistics.items():
+        async_add_external_statistics(hass, importer.metadata(short_name), rows)
+        count += len(rows)
+    if count:
+        await get_instance(hass).async_block_till_done()
+    return count
+
+
+def _import_log_file(hass: HomeAssistant, path: str, importer: TorqueLogImporter) -> int:
+    """Import a Torque CSV log file, run in the executor."""
+    imported = 0
+    with open(path, encoding="utf-8", errors="replace", newline="") as file:
+        for row in csv.reader(file):
+            importer.add_row(row)
+            if importer.pending >= IMPORT_CHUNK_SIZE:
+                # Waiting for the recorder to write each chunk keeps
+                # at most one of them in memory
+                imported += asyncio.run_coroutine_threadsafe(
+                    async_add_statistics(hass, importer, importer.pop_statistics()),
+                    hass.loop).result()
+    imported += asyncio.run_coroutine_threadsafe(
+        async_add_statistics(hass, importer, importer.pop_statistics(final=True)),
+        hass.loop).result()
+    return imported
+
+
+def _import_log_chunk(importer: TorqueLogImporter, data: bytes, final: bool = False) -> bytes:
+    """Add the complete lines of a chunk of a Torque CSV log, run in the executor.
+
+    Return the incomplete last line, to be prepended to the next chunk.
+    """
+    lines = data.split(b"\n")
+    rest = b"" if final else lines.pop()
+    for row in csv.reader(line.decode("utf-8", errors="replace") for line in lines):
+        importer.add_row(row)
+    return rest
+
+
+def _recorder_loaded(hass: HomeAssistant) -> bool:
+    return "recorder" in hass.config.components
+
+
+@callback
+def async_register_services(hass: HomeAssistant) -> None:
+    """Register the torque_logger.import_log service."""
+
+    async def async_import_log(call: ServiceCall) -> None:
+        if not _recorder_loaded(hass):
+            raise HomeAssistantError("The recorder is needed to import logs")
+        config_dir = os.path.realpath(hass.config.config_dir)
+        path = os.path.realpath(hass.config.path(call.data[ATTR_FILENAME]))
+        if os.path.commonpath([path, config_dir]) != config_dir:
+            raise HomeAssistantError(f"{call.data[ATTR_FILENAME]} is not in the config directory")
+        if not await hass.async_add_executor_job(os.path.isfile, path):
+            raise HomeAssistantError(f"{call.data[ATTR_FILENAME]} does not exist")
+
+        importer = TorqueLogImporter(call.data[ATTR_CAR])
+        try:
+            imported = await hass.async_add_executor_job(
+                _import_log_file, hass, path, importer)
+        except ValueError as err:
+            raise HomeAssistantError(f"Cannot import {path}: {err}") from err
+        _LOGGER.info("Imported %d rows of %s as %d statistics",
+                     importer.rows, path, imported)
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_IMPORT_LOG, async_import_log, schema=IMPORT_LOG_SCHEMA)
+
+
+class TorqueLogUploadView(HomeAssistantView):
+    """Import a whole Torque CSV trip log sent in one POST request."""
+
+    url = "/api/torque_logger/log"
+    name = "api:torque_logger:log"
+
+    def __init__(self, hass: HomeAssistant):
+        """Initialize a Torque log view."""
+        self.hass = hass
+
+    async def post(self, request):
+        """Handle Torque CSV log POST request."""
+        if client_for_email(self.hass, request.query.get("eml")) is None:
+            return self.json_message("Not configured email", HTTPStatus.FORBIDDEN)
+        car_name = request.query.get("profileName")
+        if not car_name:
+            return self.json_message("Missing profileName", HTTPStatus.BAD_REQUEST)
+        if not _recorder_loaded(self.hass):
+            return self.json_message(
+                "The recorder is needed to import logs", HTTPStatus.SERVICE_UNAVAILABLE)
+
+        importer = TorqueLogImporter(car_name)
+        imported = 0
+        rest = b""
+        try:
+            # The body is read in chunks, never as a whole, and parsed
+            # in the executor so a long log does not stall the loop
+            async for chunk in request.content.iter_chunked(IMPORT_READ_SIZE):
+                rest = await self.hass.async_add_executor_job(
+                    _import_log_chunk, importer, rest + chunk)
+                if importer.pending >= IMPORT_CHUNK_SIZE:
+                    imported += await async_add_statistics(
+                        self.hass, importer, importer.pop_statistics())
+            await self.hass.async_add_executor_job(
+                _import_log_chunk, importer, rest, True)
+        except ValueError as err:
+            return self.json_message(str(err), HTTPStatus.BAD_REQUEST)
+        imported += await async_add_statistics(
+            self.hass, importer, importer.pop_statistics(final=True))
+
+        _LOGGER.info("Imported %d rows of %s as %d statistics",
+                     importer.rows, car_name, imported)
+        return self.json({"rows": importer.rows, "statistics": imported})
@@ -0,0 +1,46 @@
+"""Torque Logger ingest metrics."""
+from collections import deque
+import statistics
+import time
+
+from .const import LATENCY_SAMPLES
+
+
+class IngestMetrics:
+    """Lightweight counters of the work done by the Torque view.
+
+    Updating them costs a few integer operations per upload; rates and
+    latency percentiles are only computed when the diagnostic sensors
+    poll them.
+    """
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.uploads = 0
+        self.unknown_keys = 0
+        self.dropped = 0
+        # Seconds from a request being parsed to its session being published
+        self.latencies: deque[float] = deque(maxlen=LATENCY_SAMPLES)
+        self._rate_mark = (time.monotonic(), 0)
+
+    def uploads_per_second(self) -> float:
+        """Return the upload rate since the previous call."""
+        now = time.monotonic()
+        since, uploads = self._rate_mark
+        self._rate_mark = (now, self.uploads)
+        if now <= since:
+            return 0.0
+        return (self.uploads - uploads) / (now - since)
+
+    def latency_summary(self) -> dict:
+        """Return p50/p95/p99/max of the recent latencies in milliseconds."""
+        if len(self.latencies) < 2:
+            latency = round(self.latencies[0] * 1000, 2) if self.latencies else None
+            return {"p50": latency, "p95": latency, "p99": latency, "max": latency}
+        quantiles = statistics.quantiles(self.latencies, n=100, method="inclusive")
+        return {
+            "p50": round(quantiles[49] * 1000, 2),
+            "p95": round(quantiles[94] * 1000, 2),
+            "p99": round(quantiles[98] * 1000, 2),
+            "max": round(max(self.latencies) * 1000, 2),
+        }
@@ -1,19 +1,21 @@
 """Sensor platform for Torque Logger."""
 
+from functools import lru_cache
 import logging
 import re
 from typing import TYPE_CHECKING
-from homeassistant.components.sensor import RestoreSensor
+from homeassistant.components.sensor import RestoreSensor, SensorEntity
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceEntryType
+from homeassistant.helpers.entity import DeviceInfo, EntityCategory
 from homeassistant.helpers import entity_registry, device_registry
 
 from .const import (
-    CITY_ICON, DISTANCE_ICON, DOMAIN,
-    DEFAULT_ICON, FUEL_ICON, HIGHWAY_ICON, SENSOR, SPEED_ICON,
-    TIME_ICON)
+    ATTRIBUTION, CITY_ICON, DISTANCE_ICON, DOMAIN,
+    DEFAULT_ICON, DEFAULT_PRECISION, FUEL_ICON, HIGHWAY_ICON, METRICS_SCAN_INTERVAL, NAME, SENSOR,
+    SPEED_ICON, TIME_ICON)
 from .entity import TorqueEntity
 
 if TYPE_CHECKING:
@@ -22,6 +24,65 @@ if TYPE_CHECKING:
 
 _LOGGER: logging.Logger = logging.getLogger(__package__)
 
+# Only the ingest metrics sensors poll, Torque sensors are pushed
+SCAN_INTERVAL = METRICS_SCAN_INTERVAL
+
+# key: (name, unit, icon, value)
+INGEST_SENSORS = {
+    "uploads_per_second": (
+        "Uploads per second", "uploads/s", "mdi:upload",
+        lambda coordinator: round(coordinator.api.metrics.uploads_per_second(), 2)),
+    "ingest_latency": (
+        "Ingest latency", "ms", "mdi:timer-outline",
+        lambda coordinator: coordinator.api.metrics.latency_summary()["p50"]),
+    "sessions": (
+        "Sessions in memory", None, "mdi:database",
+        lambda coordinator: len(coordinator.api.data)),
+    "tracked_pids": (
+        "PIDs tracked", None, "mdi:format-list-numbered",
+        lambda coordinator: len(coordinator.tracked)),
+    "unknown_keys": (
+        "Unknown keys", None, "mdi:help-circle-outline",
+        lambda coordinator: coordinator.api.metrics.unknown_keys),
+    "ingest_queue": (
+        "Ingest queue depth", None, "mdi:tray-full",
+        lambda coordinator: coordinator.api.queue.qsize()),
+    "dropped_uploads": (
+        "Dropped uploads", None, "mdi:upload-off",
+        lambda coordinator: coordinator.api.metrics.dropped),
+}
+
+# One pass over a sensor name finds every keyword; when several match,
+# the earliest group in ICON_PRIORITY wins.
+_ICON_PATTERN = re.compile(
+    r"(?P<speed>speed)|(?P<city>city)|(?P<highway>highway)|(?P<time>time|idle)"
+    r"|(?P<distance>distance)|(?P<fuel>litre|gallon)|(?P<units>kilometers|miles)",
+    re.IGNORECASE,
+)
+ICON_PRIORITY = [
+    ("speed", SPEED_ICON),
+    ("city", CITY_ICON),
+    ("highway", HIGHWAY_ICON),
+    ("time", TIME_ICON),
+    ("distance", DISTANCE_ICON),
+    ("fuel", FUEL_ICON),
+    ("units", DISTANCE_ICON),
+]
+_ICON_RANKS = {group: rank for rank, (group, _) in enumerate(ICON_PRIORITY)}
+
+
+@lru_cache(maxsize=1024)
+def icon_for_name(name: str) -> str:
+    """Return the icon of a sensor name.
+
+    Sensors of the same PID share their name across cars, so the result
+    is cached and a restored fleet classifies every PID only once.
+    """
+    ranks = [_ICON_RANKS[match.lastgroup] for match in _ICON_PATTERN.finditer(name)]
+    if not ranks:
+        return DEFAULT_ICON
+    return ICON_PRIORITY[min(ranks)][1]
+
 
 async def async_setup_entry(
         hass: HomeAssistant, entry: ConfigEntry,
@@ -35,13 +96,15 @@ async def async_setup_entry(
     dev_reg = device_registry.async_get(hass)
     devices = [
         device
-        for device in dev_reg.devices.values()
-        for identifier in device.identifiers
-        if identifier[0] == DOMAIN
+        for device in device_registry.async_entries_for_config_entry(
+            dev_reg, entry.entry_id)
+        if any(identifier[0] == DOMAIN and identifier[-1] == "car"
+               for identifier in device.identifiers)
     ]
     logmsg = f"{len(devices)} devices"
     _LOGGER.debug(logmsg)
 
+    restore_entities: list['TorqueSensor'] = []
     for device in devices:
         car_id = list(device.identifiers)[0][1]
         device_info = DeviceInfo(
@@ -51,16 +114,23 @@ async def async_setup_entry(
             name=device.name,
             sw_version=device.sw_version
         )
-        restore_entities = [
+        device_entities = [
             TorqueSensor(coordinator, entry,
                          sensor.entity_id[len(SENSOR) + len(car_id) + 2:len(sensor.entity_id)],
                          device_info)
-            for sensor in ent_reg.entities.values()
-            if sensor.device_id == device.id and sensor.domain == SENSOR
+            for sensor in entity_registry.async_entries_for_device(
+                ent_reg, device.id, include_disabled_entities=True)
+            if sensor.domain == SENSOR and sensor.config_entry_id == entry.entry_id
         ]
-        logmsg = f"Restoring {', '.join([sensor.entity_id for sensor in restore_entities])}"
-        _LOGGER.debug(logmsg)
-        async_add_entities(restore_entities)
+        coordinator.tracked.update((car_id, sensor.sensor_key) for sensor in device_entities)
+        restore_entities.extend(device_entities)
+
+    logmsg = f"Restoring {', '.join([sensor.entity_id for sensor in restore_entities])}"
+    _LOGGER.debug(logmsg)
+    async_add_entities(restore_entities)
+
+    async_add_entities(
+        TorqueIngestSensor(coordinator, entry, key) for key in INGEST_SENSORS)
 
 
 class TorqueSensor(TorqueEntity, RestoreSensor):
@@ -70,53 +140,84 @@ class TorqueSensor(TorqueEntity, RestoreSensor):
                  config_entry: ConfigEntry, sensor_key: str, device: DeviceInfo):
         super().__init__(coordinator, config_entry, sensor_key, device)
 
-        if self.coordinator.data is not None and "meta" in self.coordinator.data and self.sensor_key in self.coordinator.data["meta"]:
-            self._attr_native_unit_of_measurement = (self.coordinator
-                                                     .data["meta"][self.sensor_key]["unit"])
-            sensor_name = self.coordinator.data["meta"].get(self.sensor_key)["name"]
+        self._precision = DEFAULT_PRECISION
+        car_data = self.coordinator.car_data(self._car_id)
+        if car_data is not None and "meta" in car_data and self.sensor_key in car_data["meta"]:
+            sensor_name = car_data["meta"].get(self.sensor_key)["name"]
             self._attr_name = sensor_name
             self._set_icon()
+            self._update_value(car_data)
 
         self.entity_id = f"{SENSOR}.{self._car_id}_{sensor_key}"
-        self._restored_state = None
-
-    @property
-    def native_value(self):
-        """Return the native value of the sensor."""
-        if self.coordinator.data is not None and self.sensor_key in self.coordinator.data:
-            return round(float(self.coordinator.data[self.sensor_key]), 2)
-        elif self._restored_state is not None:
-            return round(float(self._restored_state))
-        else:
-            return None
+
+    def _update_value(self, car_data: dict) -> None:
+        """Cache the rounded value, HA reads native_value several times per write."""
+        meta = car_data["meta"].get(self.sensor_key)
+        if meta is not None:
+            self._attr_native_unit_of_measurement = meta["unit"]
+            self._precision = meta.get("precision", DEFAULT_PRECISION)
+            self._attr_suggested_display_precision = self._precision
+        value = car_data.get(self.sensor_key)
+        if value is not None:
+            self._attr_native_value = round(value, self._precision)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Pick up the new value and unit changes, e.g. of the imperial option."""
+        self._update_value(self.coordinator.car_data(self._car_id))
+        super()._handle_coordinator_update()
 
     async def async_added_to_hass(self) -> None:
         """Handle entity which will be added."""
         await super().async_added_to_hass()
+        # Uploads received while discovery was debounced are newer than
+        # the value read when the entity was built, and than its last state
+        car_data = self.coordinator.car_data(self._car_id)
+        if car_data is not None and self.sensor_key in car_data.get("meta", {}):
+            self._update_value(car_data)
+            return
         state = await self.async_get_last_state()
         native_state = await self.async_get_last_sensor_data()
         if not state or not native_state:
             return
         logmsg = f"Restore state of {self.entity_id} to {native_state}"
         _LOGGER.debug(logmsg)
-        self._restored_state = native_state.native_value
+        if self._attr_native_value is None and native_state.native_value is not None:
+            self._attr_native_value = float(native_state.native_value)
         self._attr_name = state.name
         self._attr_native_unit_of_measurement = native_state.native_unit_of_measurement
         self._set_icon()
 
     def _set_icon(self) -> None:
-        self._attr_icon = DEFAULT_ICON
-        if re.search('kilometers', self._attr_name, re.IGNORECASE) or re.search('miles', self._attr_name, re.IGNORECASE):
-            self._attr_icon = DISTANCE_ICON
-        if re.search('litre', self._attr_name, re.IGNORECASE) or re.search('gallon', self._attr_name, re.IGNORECASE):
-            self._attr_icon = FUEL_ICON
-        if re.search('distance', self._attr_name, re.IGNORECASE):
-            self._attr_icon = DISTANCE_ICON
-        if re.search('time', self._attr_name, re.IGNORECASE) or re.search('idle', self._attr_name, re.IGNORECASE):
-            self._attr_icon = TIME_ICON
-        if re.search('highway', self._attr_name, re.IGNORECASE):
-            self._attr_icon = HIGHWAY_ICON
-        if re.search('city', self._attr_name, re.IGNORECASE):
-            self._attr_icon = CITY_ICON
-        if re.search('speed', self._attr_name, re.IGNORECASE):
-            self._attr_icon = SPEED_ICON
+        self._attr_icon = icon_for_name(self._attr_name or "")
+
+
+class TorqueIngestSensor(SensorEntity):
+    """Diagnostic sensor reporting how hard the integration is working."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_should_poll = True
+
+    def __init__(self, coordinator: 'TorqueLoggerCoordinator',
+                 config_entry: ConfigEntry, key: str):
+        self.coordinator = coordinator
+        self.key = key
+        name, unit, icon, self._value = INGEST_SENSORS[key]
+        self._attr_name = f"{NAME} {name}"
+        self._attr_native_unit_of_measurement = unit
+        self._attr_icon = icon
+        self._attr_unique_id = f"{DOMAIN}_{config_entry.entry_id}_ingest_{key}"
+        self._attr_attribution = ATTRIBUTION
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, config_entry.entry_id, "ingest")},
+            entry_type=DeviceEntryType.SERVICE,
+            manufacturer="Torque",
+            name=NAME,
+        )
+
+    async def async_update(self) -> None:
+        """Read the current value of the metric."""
+        self._attr_native_value = self._value(self.coordinator)
+        if self.key == "ingest_latency":
+            self._attr_extra_state_attributes = (
+                self.coordinator.api.metrics.latency_summary())
@@ -0,0 +1,114 @@
+"""Torque Logger session store."""
+from collections import OrderedDict
+from datetime import datetime
+import logging
+import time
+
+from homeassistant.core import callback
+
+from .const import DEFAULT_MAX_SESSIONS, DEFAULT_SESSION_TTL
+
+_LOGGER: logging.Logger = logging.getLogger(__package__)
+
+
+def _new_session() -> dict:
+    return {
+        "profile": {},
+        "unit": {},
+        "defaultUnit": {},
+        "fullName": {},
+        "shortName": {},
+        "value": {},
+        "changed": set(),
+        # PIDs sent since the session was last published, unlike value
+        # this never holds the last-known values of PIDs gone quiet
+        "received": set(),
+        "fields": {},
+        "discover": False,
+        # unrecognised key -> {"count": n, "value": last value}
+        "unknown": {},
+        "time": 0,
+    }
+
+
+class TorqueSessionStore:
+    """Bounded store of Torque sessions with idle TTL and LRU eviction.
+
+    Every Torque trip starts a new session, so sessions are evicted once
+    they have been idle for longer than the TTL or when more than
+    ``max_sessions`` are held. Car names are kept in a small profile id
+    index that outlives the sessions, so uploads without ``profileName``
+    resolve the car in O(1).
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = DEFAULT_MAX_SESSIONS,
+        ttl: float = DEFAULT_SESSION_TTL,
+    ) -> None:
+        """Initialize."""
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self._sessions: dict[str, dict] = {}
+        self._seen: OrderedDict[str, float] = OrderedDict()
+        self._profile_names: OrderedDict[str, str] = OrderedDict()
+
+    def __contains__(self, session: str) -> bool:
+        return session in self._sessions
+
+    def __getitem__(self, session: str) -> dict:
+        return self._sessions[session]
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __iter__(self):
+        return iter(self._sessions)
+
+    def keys(self):
+        """Return the ids of the sessions held."""
+        return self._sessions.keys()
+
+    def values(self):
+        """Return the sessions held."""
+        return self._sessions.values()
+
+    def touch(self, session: str) -> dict:
+        """Return the data of a session, creating it if needed."""
+        data = self._sessions.get(session)
+        if data is None:
+            data = self._sessions[session] = _new_session()
+        self._seen[session] = time.monotonic()
+        self._seen.move_to_end(session)
+        while len(self._sessions) > self.max_sessions:
+            self._evict(next(iter(self._seen)))
+        return data
+
+    def remember_name(self, profile_id: str, name: str) -> None:
+        """Index the car name of a Torque profile id."""
+        self._profile_names[profile_id] = name
+        self._profile_names.move_to_end(profile_id)
+        while len(self._profile_names) > self.max_sessions:
+            self._profile_names.popitem(last=False)
+
+    def car_name(self, profile_id: str):
+        """Return the car name indexed for a Torque profile id."""
+        return self._profile_names.get(profile_id)
+
+    @callback
+    def async_sweep(self, _now: datetime = None) -> None:
+        """Evict sessions idle for longer than the TTL."""
+        deadline = time.monotonic() - self.ttl
+        expired = []
+        for session, seen in self._seen.items():
+            if seen > deadline:
+                break
+            expired.append(session)
+        for session in expired:
+            self._evict(session)
+        if expired:
+            _LOGGER.debug("Evicted %d idle sessions", len(expired))
+
+    def _evict(self, session: str) -> None:
+        del self._seen[session]
+        del self._sessions[session]
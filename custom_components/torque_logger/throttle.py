@@ -0,0 +1,71 @@
+"""Torque Logger publish throttle."""
+import time
+
+from .const import DEFAULT_DEADBANDS
+
+
+def _as_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class PublishThrottle:
+    """Coalesce fast uploads into fewer state writes per sensor.
+
+    A changed key is written at most once per ``min_interval`` seconds,
+    and only when it moved by at least the deadband of its unit since
+    the last written value. Keys held back stay pending until ``flush``
+    releases them once their interval elapsed, so the last value of a
+    trip is written even when no upload follows. A ``min_interval`` of 0
+    turns the throttle off.
+    """
+
+    def __init__(self, min_interval: float, deadbands: dict = DEFAULT_DEADBANDS) -> None:
+        """Initialize."""
+        self.min_interval = min_interval
+        self.deadbands = deadbands
+        # (car_id, key) -> (monotonic time, value) of the last write
+        self._published: dict[tuple[str, str], tuple[float, float]] = {}
+        # car_id -> {key: latest value} of keys held back
+        self._pending: dict[str, dict[str, object]] = {}
+
+    def filter(self, car_id: str, session_data: dict) -> set[str]:
+        """Return the keys of an upload that should be written now."""
+        if not self.min_interval:
+            return set(session_data["changed"])
+        pending = self._pending.setdefault(car_id, {})
+        for key in session_data["changed"]:
+            pending[key] = session_data[key]
+        return self.flush(car_id, session_data["meta"])
+
+    def flush(self, car_id: str, meta: dict) -> set[str]:
+        """Return the pending keys of a car whose interval elapsed."""
+        pending = self._pending.get(car_id)
+        if not pending:
+            return set()
+
+        now = time.monotonic()
+        publish = set()
+        for key, value in list(pending.items()):
+            last = self._published.get((car_id, key))
+            if last is not None and now - last[0] < self.min_interval:
+                continue
+            del pending[key]
+            number = _as_float(value)
+            if last is not None and number is not None and last[1] is not None:
+                unit = meta[key]["unit"] if key in meta else ""
+                if abs(number - last[1]) < self.deadbands.get(unit, 0):
+                    continue
+            self._published[(car_id, key)] = (now, number)
+            publish.add(key)
+        return publish
+
+    def next_flush(self, car_id: str):
+        """Return the seconds until a pending key of a car is due, or None."""
+        pending = self._pending.get(car_id)
+        if not pending:
+            return None
+        due = min(self._published[(car_id, key)][0] for key in pending) + self.min_interval
+        return max(due - time.monotonic(), 0)
@@ -0,0 +1,119 @@
+"""Unit conversion for Torque Logger."""
+from functools import lru_cache
+import logging
+
+_LOGGER: logging.Logger = logging.getLogger(__package__)
+
+IMPERIAL_UNITS = {
+    "km": "mi",
+    "°C": "°F",
+    "km/h": "mph",
+    "m": "ft",
+    "l": "gal",
+    "L": "gal",
+    "litre": "gal",
+}
+
+# (scale, offset) so that value_out = value_in * scale + offset
+AFFINE_CONVERSIONS = {
+    ("km", "mi"): (1 / 1.609344, 0.0),
+    ("°C", "°F"): (1.8, 32.0),
+    ("km/h", "mph"): (1 / 1.609344, 0.0),
+    ("m", "ft"): (1 / 0.3048, 0.0),
+    ("l", "gal"): (1 / 3.785411784, 0.0),
+    ("L", "gal"): (1 / 3.785411784, 0.0),
+    ("litre", "gal"): (1 / 3.785411784, 0.0),
+    ("mph", "km/h"): (1.609344, 0.0),
+    # Fuel flow PIDs the derived metrics read
+    ("l/hr", "L/hr"): (1.0, 0.0),
+    ("L/hr", "l/hr"): (1.0, 0.0),
+    ("cc/min", "L/hr"): (0.06, 0.0),
+    ("cc/min", "l/hr"): (0.06, 0.0),
+}
+
+prettyPint = {
+    "degC": "°C",
+    "degF": "°F",
+    "mile / hour": "mph",
+    "kilometer / hour": "km/h",
+    "mile": "mi",
+    "kilometer": "km",
+    "meter": "m",
+    "foot": "ft",
+    "liter": "l",
+    "gallon": "gal",
+}
+
+_registry = None
+# Set once a pair missing from AFFINE_CONVERSIONS was asked for
+_registry_needed = False
+
+
+def registry_needed() -> bool:
+    """Return whether a conversion waits for the pint registry to be loaded."""
+    return _registry_needed and _registry is None
+
+
+def load_registry() -> None:
+    """Build the pint registry, it blocks for a while so run it in the executor."""
+    global _registry  # pylint: disable=global-statement
+    if _registry is None:
+        # pylint: disable=import-outside-toplevel
+        import pint
+
+        try:
+            import numpy as np
+
+            np.cumproduct = np.cumprod  # Patch the deprecated function
+        except ImportError:
+            pass
+        _registry = pint.UnitRegistry()
+
+
+def _unpretty_units(unit):
+    for pint_unit, pretty_unit in prettyPint.items():
+        if pretty_unit == unit:
+            return pint_unit
+
+    return unit
+
+
+def get_converter(u_in: str, u_out: str):
+    """Return the (scale, offset) converting u_in to u_out, or None.
+
+    Pairs missing from AFFINE_CONVERSIONS are looked up in pint once
+    load_registry has run. The registry is never built on the caller's
+    thread, a miss only flags it as needed, see registry_needed.
+    """
+    global _registry_needed  # pylint: disable=global-statement
+    if (u_in, u_out) in AFFINE_CONVERSIONS:
+        return AFFINE_CONVERSIONS[(u_in, u_out)]
+    if _registry is None:
+        _registry_needed = True
+        _LOGGER.debug("Unit registry not loaded, cannot convert %s to %s", u_in, u_out)
+        return None
+    return _pint_converter(u_in, u_out)
+
+
+@lru_cache(maxsize=None)
+def _pint_converter(u_in: str, u_out: str):
+    """Derive the affine factors of an unknown pair from pint."""
+    try:
+        quantity = _registry.Quantity
+        p_in = _unpretty_units(u_in)
+        p_out = _unpretty_units(u_out)
+        zero = quantity(0.0, p_in).to(p_out).magnitude
+        one = quantity(1.0, p_in).to(p_out).magnitude
+    except Exception:  # pylint: disable=broad-except
+        _LOGGER.warning("Cannot convert %s to %s", u_in, u_out)
+        return None
+    return one - zero, zero
+
+
+def convert_units(value: float, u_in: str, u_out: str) -> float:
+    """Convert a value from u_in to u_out."""
+    converter = get_converter(u_in, u_out)
+    if converter is None:
+        return value
+    scale, offset = converter
+    return value * scale + offset
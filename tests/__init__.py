@@ -0,0 +1 @@
+"""Tests for the Torque Logger integration."""
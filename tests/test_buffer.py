@@ -0,0 +1,78 @@
+"""Tests for the sample ring buffer."""
+import math
+from unittest.mock import AsyncMock
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.torque_logger.api import TorqueReceiveDataView
+from custom_components.torque_logger.buffer import SampleBuffer, sample_time
+from custom_components.torque_logger.const import CONF_BUFFER_SIZE, CONF_EMAIL, DOMAIN
+from custom_components.torque_logger.coordinator import TorqueLoggerCoordinator
+from custom_components.torque_logger.session import TorqueSessionStore
+
+EMAIL = "driver@example.com"
+
+
+def _flatten(segments) -> list[float]:
+    return [value for segment in segments for value in segment]
+
+
+def test_sample_time():
+    """Torque times are in milliseconds, missing ones fall back to now."""
+    assert sample_time({"time": "1697620000500"}) == 1697620000.5
+    assert sample_time({"time": "x"}) > 1697620000
+
+
+def test_ring_keeps_the_newest_samples():
+    """Once full, the oldest samples are overwritten and reads wrap around."""
+    buffer = SampleBuffer(3)
+    for second in range(5):
+        assert buffer.append(100 + second, {"speed": float(second)})
+    assert len(buffer) == 3
+    assert buffer.latest_time == 104
+    assert len(buffer.window("speed")) == 2
+    assert _flatten(buffer.window("speed")) == [2, 3, 4]
+    assert _flatten(buffer.time_window()) == [102, 103, 104]
+
+
+def test_window_of_the_last_seconds():
+    """Only the samples of the last seconds are returned, oldest first."""
+    buffer = SampleBuffer(10)
+    for second in range(6):
+        buffer.append(100 + second, {"speed": float(second)})
+    assert _flatten(buffer.window("speed", 2)) == [3, 4, 5]
+    assert buffer.window("rpm") == []
+
+
+def test_missing_pids_and_stale_samples():
+    """PIDs missing from a sample read as NaN, older samples are ignored."""
+    buffer = SampleBuffer(4)
+    buffer.append(100, {"speed": 10.0})
+    buffer.append(101, {"rpm": 900.0})
+    assert not buffer.append(101, {"speed": 20.0})
+
+    speed = _flatten(buffer.window("speed"))
+    assert speed[0] == 10 and math.isnan(speed[1])
+    rpm = _flatten(buffer.window("rpm"))
+    assert math.isnan(rpm[0]) and rpm[1] == 900
+
+
+async def test_only_sent_pids_are_buffered(hass):
+    """PIDs an upload did not send are not recorded with their last value."""
+    entry = MockConfigEntry(
+        domain=DOMAIN, data={CONF_EMAIL: EMAIL}, options={CONF_BUFFER_SIZE: 10})
+    view = TorqueReceiveDataView(TorqueSessionStore(), EMAIL, False)
+    view.coordinator = TorqueLoggerCoordinator(hass, view, entry)
+    view.coordinator.add_entities = AsyncMock()
+
+    for second, values in enumerate([{"kd": "50", "kc": "2000"}, {"kd": "60"}]):
+        session = view.parse_fields({
+            "eml": EMAIL, "session": "1", "profileName": "Car",
+            "time": str(1697620000000 + second * 1000), **values})
+        await view._async_publish_data(session)  # pylint: disable=protected-access
+
+    buffer = view.coordinator.buffers["car"]
+    assert _flatten(buffer.window("speed")) == [50, 60]
+    rpm = _flatten(buffer.window("engine_rpm"))
+    assert rpm[0] == 2000 and math.isnan(rpm[1])
+    assert buffer.window("derived_trip_max_speed") == []
@@ -0,0 +1,110 @@
+"""Tests for the derived trip metrics."""
+import pytest
+
+from benchmarks.torque_queries import EMAIL, metadata_query, parse_query, value_query
+from custom_components.torque_logger.api import TorqueReceiveDataView
+from custom_components.torque_logger.const import MAX_INTEGRATION_GAP, TRIP_TIMEOUT
+from custom_components.torque_logger.derived import DerivedMetrics, TripMetrics
+from custom_components.torque_logger.session import TorqueSessionStore
+
+
+class StubCoordinator:
+    """Coordinator keeping the latest data per car, without entities."""
+
+    def __init__(self) -> None:
+        self.cars: dict[str, dict] = {}
+        self.changed: list[set[str]] = []
+
+    def async_update_car(self, car_id: str, session_data: dict) -> None:
+        self.cars.setdefault(car_id, {}).update(session_data)
+        self.changed.append(session_data["changed"])
+
+    async def add_entities(self, session_data: dict) -> None:
+        pass
+
+
+def _session(time_ms: int, **values: float) -> dict:
+    return {"value": values, "defaultUnit": {}, "received": set(values),
+            "time": str(time_ms)}
+
+
+def _session_data(time_ms: int) -> dict:
+    return {"time": str(time_ms), "meta": {}, "changed": set()}
+
+
+def test_trip_integrates_distance_and_fuel():
+    """An hour at 60 km/h burning 6 L/hr is 60 km at 10 l/100km."""
+    trip = TripMetrics()
+    for second in range(0, 3601, 30):
+        trip.add(1_000_000 + second, speed=60.0, rpm=2000.0, fuel_flow=6.0)
+    values = trip.values()
+    assert values["derived_trip_distance"] == pytest.approx(60)
+    assert values["derived_trip_fuel_used"] == pytest.approx(6)
+    assert values["derived_trip_economy"] == pytest.approx(10)
+    assert values["derived_trip_avg_speed"] == pytest.approx(60)
+    assert values["derived_trip_min_rpm"] == values["derived_trip_max_rpm"] == 2000
+
+
+def test_trip_rolling_average_and_restart():
+    """The rolling average forgets old speeds and a long stop ends the trip."""
+    trip = TripMetrics()
+    trip.add(0, speed=100.0)
+    trip.add(MAX_INTEGRATION_GAP, speed=50.0)
+    assert trip.values()["derived_avg_speed"] == 75
+    trip.add(400, speed=20.0)
+    assert trip.values()["derived_avg_speed"] == 20
+    # No distance is made up over the gap, nor is its time averaged
+    assert trip.values()["derived_trip_distance"] == pytest.approx(75 / 60)
+    assert trip.values()["derived_trip_avg_speed"] == pytest.approx(75)
+    assert trip.values()["derived_trip_min_speed"] == 20
+
+    assert not trip.add(300, speed=10.0)
+    trip.add(400 + TRIP_TIMEOUT + 1, speed=30.0)
+    assert trip.values()["derived_trip_max_speed"] == 30
+    assert trip.values()["derived_trip_distance"] == 0
+
+
+def test_only_moved_metrics_are_changed():
+    """A metric is only marked changed when its value or unit moved."""
+    derived = DerivedMetrics()
+    first = _session_data(1_000_000)
+    assert derived.update("car", _session(1_000_000, **{"0c": 2000.0}), first, False)
+    assert first["changed"] == {"derived_trip_min_rpm", "derived_trip_max_rpm"}
+
+    lower = _session_data(1_001_000)
+    assert not derived.update("car", _session(1_001_000, **{"0c": 1500.0}), lower, False)
+    assert lower["changed"] == {"derived_trip_min_rpm"}
+    assert lower["derived_trip_max_rpm"] == 2000
+
+    between = _session_data(1_002_000)
+    derived.update("car", _session(1_002_000, **{"0c": 1800.0}), between, False)
+    assert between["changed"] == set()
+
+
+def test_only_sent_inputs_are_used():
+    """A speed PID that stopped reporting is not integrated any further."""
+    derived = DerivedMetrics()
+    session = _session(1_000_000, **{"0d": 60.0})
+    derived.update("car", session, _session_data(1_000_000), False)
+    # The OBD link drops, GPS keeps uploading
+    for second in range(1, 31):
+        session["received"] = {"ff1006"}
+        data = _session_data(1_000_000 + second * 1000)
+        derived.update("car", session, data, False)
+    assert data["derived_trip_distance"] == 0
+
+
+async def test_inputs_are_read_by_pid_code():
+    """Torque names PIDs after the user's short names, not the catalogue's."""
+    view = TorqueReceiveDataView(TorqueSessionStore(), EMAIL, False)
+    view.coordinator = StubCoordinator()
+    session = view.parse_fields(parse_query(metadata_query("session", "Car", 20)))
+    for sample in range(5):
+        session = view.parse_fields(parse_query(value_query("session", "Car", 20, sample)))
+        await view._async_publish_data(session)  # pylint: disable=protected-access
+
+    car = view.coordinator.cars["car"]
+    assert "revs" in car
+    assert car["derived_trip_max_rpm"] == pytest.approx(1843.5 + 4)
+    assert car["derived_trip_fuel_used"] > 0
+    assert car["meta"]["derived_trip_fuel_used"]["unit"] == "l"
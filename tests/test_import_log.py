@@ -0,0 +1,44 @@
+"""Tests for importing Torque CSV logs into the recorder."""
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.components.recorder.statistics import statistics_during_period
+from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
+
+from custom_components.torque_logger.const import CONF_EMAIL, DOMAIN
+
+from .test_importer import HEADER, _row
+
+EMAIL = "driver@example.com"
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(recorder_mock, enable_custom_integrations):
+    """Start the recorder before Home Assistant is set up."""
+    yield
+
+
+async def test_upload_waits_for_the_recorder(recorder_mock, hass, hass_client):
+    """Uploaded logs are written by the recorder before the view answers."""
+    entry = MockConfigEntry(domain=DOMAIN, data={CONF_EMAIL: EMAIL})
+    entry.add_to_hass(hass)
+    assert await async_setup_component(hass, DOMAIN, {})
+    await hass.async_block_till_done()
+    client = await hass_client()
+
+    log = "\r\n".join(",".join(row) for row in [
+        HEADER,
+        _row("18-Oct-2023 10:00:01.000", "800", "10"),
+        _row("18-Oct-2023 11:00:01.000", "1200", "20"),
+    ])
+    response = await client.post("/api/torque_logger/log", data=log, params={
+        "eml": EMAIL, "profileName": "My Car"})
+    assert response.status == 200
+    assert (await response.json())["rows"] == 2
+
+    statistic_id = "torque_logger:my_car_engine_rpm"
+    statistics = await recorder_mock.async_add_executor_job(
+        statistics_during_period, hass, dt_util.utc_from_timestamp(0), None,
+        {statistic_id}, "hour", None, {"mean"})
+    assert [row["mean"] for row in statistics[statistic_id]] == [800, 1200]
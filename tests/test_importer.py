@@ -0,0 +1,93 @@
+"""Tests for the CSV trip log importer."""
+from datetime import timedelta
+
+import pytest
+
+from custom_components.torque_logger.importer import (
+    TorqueLogImporter,
+    _import_log_chunk,
+    _parse_column,
+)
+
+HEADER = [
+    "GPS Time", "Device Time", "Longitude", "Latitude", "G(x)", "G(y)", "G(z)",
+    "G(calibrated)", "Engine RPM(rpm)", "Speed (OBD)(km/h)",
+    "Trip time(whilst moving)(s)", "Vehicle Speed", "Vehicle Speed",
+]
+
+
+def _row(device_time: str, rpm: str, speed: str) -> list[str]:
+    return ["-", device_time, "-46.6", "-23.5", "0.1", "0.2", "0.3", "0.4",
+            rpm, speed, "10", "1", "2"]
+
+
+@pytest.mark.parametrize(
+    ("column", "expected"),
+    [
+        ("Engine RPM(rpm)", ("engine_rpm", "Engine RPM", "rpm")),
+        ("Speed (OBD)(km/h)", ("speed_obd", "Speed (OBD)", "km/h")),
+        ("Trip time(whilst moving)(s)",
+         ("trip_time_whilst_moving", "Trip time(whilst moving)", "s")),
+        ("G(x)", ("g_x", "G(x)", "")),
+        ("G(calibrated)", ("g_calibrated", "G(calibrated)", "")),
+        ("Coolant Temperature", ("coolant_temp", "Coolant Temperature", "°C")),
+    ],
+)
+def test_parse_column(column, expected):
+    """Only a suffix that is a unit is taken as the unit of a column."""
+    assert _parse_column(column) == expected
+
+
+def test_columns_get_their_own_statistics():
+    """Columns with the same name are never averaged together."""
+    importer = TorqueLogImporter("My Car")
+    importer.add_row(HEADER)
+    importer.add_row(_row("18-Oct-2023 10:00:01.000", "800", "0"))
+    statistics = importer.pop_statistics(final=True)
+
+    assert {"g_x", "g_y", "g_z", "g_calibrated"} <= statistics.keys()
+    assert statistics["speed"][0]["mean"] == 1
+    assert statistics["speed_2"][0]["mean"] == 2
+    assert importer.metadata("g_x")["statistic_id"] == "torque_logger:my_car_g_x"
+
+
+def test_rows_are_aggregated_per_period():
+    """Rows are reduced to mean/min/max per period, skipping missing values."""
+    importer = TorqueLogImporter("My Car", timedelta(minutes=5))
+    importer.add_row(HEADER)
+    importer.add_row(_row("18-Oct-2023 10:00:01.000", "800", "10"))
+    importer.add_row(_row("18-Oct-2023 10:01:01.000", "1200", "-"))
+    # A resumed log repeats its header
+    importer.add_row(HEADER)
+    importer.add_row(_row("18-Oct-2023 10:06:01.000", "2000", "50"))
+    statistics = importer.pop_statistics(final=True)
+
+    assert importer.rows == 3
+    first, second = statistics["engine_rpm"]
+    assert (first["mean"], first["min"], first["max"]) == (1000, 800, 1200)
+    assert second["start"] - first["start"] == timedelta(minutes=5)
+    assert [row["mean"] for row in statistics["speed_obd"]] == [10, 50]
+    assert importer.metadata("engine_rpm")["unit_of_measurement"] == "rpm"
+
+
+def test_log_chunks_split_lines():
+    """Lines cut by a chunk boundary are parsed once the rest arrives."""
+    importer = TorqueLogImporter("My Car")
+    data = "\r\n".join(",".join(row) for row in [
+        HEADER,
+        _row("18-Oct-2023 10:00:01.000", "800", "0"),
+        _row("18-Oct-2023 10:00:02.000", "1200", "0"),
+    ]).encode()
+    rest = b""
+    for start in range(0, len(data), 7):
+        rest = _import_log_chunk(importer, rest + data[start:start + 7])
+    assert importer.rows == 1
+    _import_log_chunk(importer, rest, True)
+    assert importer.rows == 2
+    assert importer.pop_statistics(final=True)["engine_rpm"][0]["mean"] == 1000
+
+
+def test_missing_time_column():
+    """Files that are not Torque logs are rejected."""
+    with pytest.raises(ValueError):
+        TorqueLogImporter("My Car").add_row(["Engine RPM(rpm)"])
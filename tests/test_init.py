@@ -0,0 +1,125 @@
+"""Tests for setting up and reloading config entries."""
+from datetime import timedelta
+
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from homeassistant.helpers import device_registry, entity_registry
+from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
+
+from custom_components.torque_logger.const import (
+    CONF_EMAIL,
+    CONF_PUBLISH_INTERVAL,
+    DEVICE_TRACKER,
+    DISCOVERY_DEBOUNCE,
+    DOMAIN,
+    ENTITY_GPS,
+    SENSOR,
+)
+
+EMAIL = "driver@example.com"
+
+
+async def test_reload_serves_uploads_with_new_options(hass, hass_client):
+    """Uploads reach the client of the entry as it is after a reload."""
+    entry = MockConfigEntry(domain=DOMAIN, data={CONF_EMAIL: EMAIL})
+    entry.add_to_hass(hass)
+    assert await async_setup_component(hass, DOMAIN, {})
+    await hass.async_block_till_done()
+    client = await hass_client()
+
+    response = await client.get("/api/torque_logger", params={"eml": "other"})
+    assert response.status == 403
+
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+    hass.config_entries.async_update_entry(
+        entry, options={CONF_PUBLISH_INTERVAL: 5})
+    await hass.async_block_till_done()
+    reloaded = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+    assert reloaded is not coordinator
+    assert reloaded.api.throttle.min_interval == 5
+
+    response = await client.get("/api/torque_logger", params={
+        "eml": EMAIL, "session": "1", "profileName": "Car", "kd": "50"})
+    assert response.status == 200
+    assert "1" in reloaded.api.data
+    assert "1" not in coordinator.api.data
+
+
+async def test_entities_only_listen_to_their_own_key(hass, hass_client):
+    """Sensors are woken by their own key, never by the whole coordinator."""
+    entry = MockConfigEntry(domain=DOMAIN, data={CONF_EMAIL: EMAIL})
+    entry.add_to_hass(hass)
+    assert await async_setup_component(hass, DOMAIN, {})
+    await hass.async_block_till_done()
+    client = await hass_client()
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+
+    async def upload(speed: str) -> None:
+        response = await client.get("/api/torque_logger", params={
+            "eml": EMAIL, "session": "1", "profileName": "Car", "kd": speed})
+        assert response.status == 200
+        await coordinator.api.queue.join()
+
+    await upload("50")
+    # Discovered entities are added once the debounce elapsed
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=DISCOVERY_DEBOUNCE + 1))
+    await hass.async_block_till_done()
+    await upload("60")
+    await hass.async_block_till_done()
+
+    # pylint: disable=protected-access
+    assert not coordinator._listeners
+    assert ("car", "speed") in coordinator._key_listeners
+    assert hass.states.get("sensor.car_speed").state == "60.0"
+
+
+async def test_uploads_during_discovery_are_not_lost(hass, hass_client):
+    """Entities start from the latest upload, not the one that created them."""
+    entry = MockConfigEntry(domain=DOMAIN, data={CONF_EMAIL: EMAIL})
+    entry.add_to_hass(hass)
+    assert await async_setup_component(hass, DOMAIN, {})
+    await hass.async_block_till_done()
+    client = await hass_client()
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+
+    for speed, latitude in (("50", "-23.5"), ("70", "-23.6")):
+        response = await client.get("/api/torque_logger", params={
+            "eml": EMAIL, "session": "1", "profileName": "Car", "kd": speed,
+            "kff1006": latitude, "kff1005": "-46.6"})
+        assert response.status == 200
+        await coordinator.api.queue.join()
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=DISCOVERY_DEBOUNCE + 1))
+    await hass.async_block_till_done()
+
+    assert hass.states.get("sensor.car_speed").state == "70.0"
+    assert hass.states.get("device_tracker.car").attributes["latitude"] == -23.6
+
+
+async def test_trackers_are_only_restored_for_cars_with_one(hass):
+    """A car that never sent GPS does not get a tracker on reload."""
+    entry = MockConfigEntry(domain=DOMAIN, data={CONF_EMAIL: EMAIL})
+    entry.add_to_hass(hass)
+    dev_reg = device_registry.async_get(hass)
+    ent_reg = entity_registry.async_get(hass)
+    for car_id, platforms in (("car", [SENSOR]), ("van", [SENSOR, DEVICE_TRACKER])):
+        device = dev_reg.async_get_or_create(
+            config_entry_id=entry.entry_id, identifiers={(DOMAIN, car_id, "car")},
+            model=car_id.title(), name=car_id.title())
+        for platform in platforms:
+            key = "speed" if platform == SENSOR else ENTITY_GPS
+            ent_reg.async_get_or_create(
+                platform, DOMAIN, f"{DOMAIN}_{entry.entry_id}_{car_id}_{key}",
+                config_entry=entry, device_id=device.id,
+                suggested_object_id=f"{car_id}_{key}" if platform == SENSOR else car_id)
+
+    assert await async_setup_component(hass, DOMAIN, {})
+    await hass.async_block_till_done()
+
+    assert hass.states.async_entity_ids(DEVICE_TRACKER) == ["device_tracker.van"]
+    assert hass.states.get("sensor.car_speed") is not None
@@ -0,0 +1,51 @@
+"""Tests for the session store."""
+from unittest.mock import patch
+
+from custom_components.torque_logger.session import TorqueSessionStore
+
+
+class Clock:
+    """Stand-in for the time module used by the session store."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+def test_least_recently_used_session_is_evicted():
+    """Only max_sessions are held, the one idle the longest goes first."""
+    store = TorqueSessionStore(max_sessions=2)
+    store.touch("a")["value"]["0d"] = 1.0
+    store.touch("b")
+    assert store.touch("a")["value"] == {"0d": 1.0}
+    store.touch("c")
+    assert list(store) == ["a", "c"]
+
+
+def test_idle_sessions_are_swept():
+    """Sessions idle for longer than the TTL are evicted by the sweep."""
+    clock = Clock()
+    store = TorqueSessionStore(ttl=60)
+    with patch("custom_components.torque_logger.session.time", clock):
+        store.touch("old")
+        clock.now += 30
+        store.touch("new")
+        clock.now += 30
+        store.async_sweep()
+        assert list(store) == ["new"]
+        clock.now += 30
+        store.async_sweep()
+    assert len(store) == 0
+
+
+def test_car_names_outlive_sessions():
+    """The profile id index is bounded but kept when sessions go."""
+    store = TorqueSessionStore(max_sessions=2)
+    for profile_id in ("1", "2", "3"):
+        store.touch(profile_id)
+        store.remember_name(profile_id, f"Car {profile_id}")
+    assert store.car_name("1") is None
+    assert store.car_name("3") == "Car 3"
+    assert "3" in store and "1" not in store
@@ -0,0 +1,112 @@
+"""Tests for the publish throttle."""
+from datetime import timedelta
+from unittest.mock import AsyncMock, patch
+
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from homeassistant.util import dt as dt_util
+
+from custom_components.torque_logger.api import TorqueReceiveDataView
+from custom_components.torque_logger.const import (
+    CONF_EMAIL,
+    CONF_PUBLISH_INTERVAL,
+    DOMAIN,
+)
+from custom_components.torque_logger.coordinator import TorqueLoggerCoordinator
+from custom_components.torque_logger.session import TorqueSessionStore
+from custom_components.torque_logger.throttle import PublishThrottle
+
+EMAIL = "driver@example.com"
+META = {"speed": {"name": "Vehicle Speed", "unit": "km/h"}}
+
+
+class Clock:
+    """Stand-in for the time module used by the throttle."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+def _upload(speed: float) -> dict:
+    return {"speed": speed, "meta": META, "changed": {"speed"}}
+
+
+def test_disabled_throttle_writes_every_change():
+    """An interval of 0 turns the throttle off, deadbands included."""
+    throttle = PublishThrottle(0)
+    assert throttle.filter("car", _upload(50.0)) == {"speed"}
+    assert throttle.filter("car", _upload(50.1)) == {"speed"}
+    assert throttle.next_flush("car") is None
+
+
+def test_held_back_value_is_flushed_when_due():
+    """A value held back is released by flush once its interval elapsed."""
+    clock = Clock()
+    throttle = PublishThrottle(5)
+    with patch("custom_components.torque_logger.throttle.time", clock):
+        assert throttle.filter("car", _upload(50.0)) == {"speed"}
+        clock.now += 1
+        assert throttle.filter("car", _upload(0.0)) == set()
+        assert throttle.next_flush("car") == 4
+
+        clock.now += 2
+        assert throttle.flush("car", META) == set()
+        clock.now += 2
+        assert throttle.flush("car", META) == {"speed"}
+        assert throttle.next_flush("car") is None
+
+
+def test_deadband_drops_small_moves():
+    """Moves smaller than the deadband of the unit are not written."""
+    clock = Clock()
+    throttle = PublishThrottle(5)
+    with patch("custom_components.torque_logger.throttle.time", clock):
+        throttle.filter("car", _upload(50.0))
+        clock.now += 10
+        assert throttle.filter("car", _upload(50.5)) == set()
+        assert throttle.next_flush("car") is None
+        clock.now += 10
+        assert throttle.filter("car", _upload(52.0)) == {"speed"}
+
+
+async def test_last_values_of_a_trip_are_written(hass):
+    """Values held back when a car stops uploading are written by a timer."""
+    clock = Clock()
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_EMAIL: EMAIL},
+        options={CONF_PUBLISH_INTERVAL: 5},
+    )
+    view = TorqueReceiveDataView(TorqueSessionStore(), EMAIL, False, 5)
+    coordinator = TorqueLoggerCoordinator(hass, view, entry)
+    coordinator.add_entities = AsyncMock()
+    written = []
+    coordinator.async_add_key_listener(
+        "car", "speed",
+        lambda: written.append(coordinator.car_data("car")["speed"]))
+
+    with patch("custom_components.torque_logger.throttle.time", clock):
+        for second, (speed, rpm) in enumerate(
+                [(50, 2000), (52, 2100), (30, 1500), (10, 900), (0, 400)]):
+            session = view.parse_fields({
+                "eml": EMAIL, "session": "1", "profileName": "Car",
+                "time": str(1697620000000 + second * 1000),
+                "kd": str(speed), "kc": str(rpm),
+            })
+            await view._async_publish_data(session)  # pylint: disable=protected-access
+            clock.now += 1
+        assert written == [50.0]
+
+        clock.now += 1
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=1))
+        await hass.async_block_till_done()
+
+    assert written == [50.0, 0.0]
+    assert view.throttle.next_flush("car") is None
+    coordinator.async_cancel_flush()
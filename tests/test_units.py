@@ -0,0 +1,64 @@
+"""Tests for unit conversion."""
+from unittest.mock import AsyncMock, patch
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+import pytest
+
+from custom_components.torque_logger import units
+from custom_components.torque_logger.api import TorqueReceiveDataView
+from custom_components.torque_logger.const import CONF_EMAIL, DOMAIN
+from custom_components.torque_logger.coordinator import TorqueLoggerCoordinator
+from custom_components.torque_logger.derived import FUEL_FLOW_PIDS, _read
+from custom_components.torque_logger.session import TorqueSessionStore
+
+EMAIL = "driver@example.com"
+
+
+@pytest.fixture(name="no_registry")
+def no_registry_fixture():
+    """Start without the pint registry."""
+    with patch.object(units, "_registry", None), \
+            patch.object(units, "_registry_needed", False):
+        yield
+
+
+def test_fuel_flow_is_converted_without_pint(no_registry):
+    """The fuel flow units Torque sends have affine factors of their own."""
+    session = {"value": {"ff125a": 100.0}, "defaultUnit": {"ff125a": "cc/min"},
+               "received": {"ff125a"}}
+    assert _read(session, FUEL_FLOW_PIDS, "L/hr") == pytest.approx(6)
+    session["defaultUnit"]["ff125a"] = "l/hr"
+    assert _read(session, FUEL_FLOW_PIDS, "L/hr") == 100
+    assert not units.registry_needed()
+
+
+def test_pint_is_only_used_once_loaded(no_registry):
+    """Unknown pairs are not converted until the registry is built."""
+    assert units.get_converter("kPa", "psi") is None
+    assert units.registry_needed()
+    units.load_registry()
+    assert not units.registry_needed()
+    scale, offset = units.get_converter("kPa", "psi")
+    assert scale == pytest.approx(0.145038, rel=1e-5)
+    assert offset == 0
+
+
+async def test_registry_is_loaded_when_a_pair_needs_it(hass, no_registry):
+    """A pair pint converts is picked up once the registry is loaded."""
+    entry = MockConfigEntry(domain=DOMAIN, data={CONF_EMAIL: EMAIL})
+    view = TorqueReceiveDataView(TorqueSessionStore(), EMAIL, False)
+    view.coordinator = TorqueLoggerCoordinator(hass, view, entry)
+    view.coordinator.add_entities = AsyncMock()
+
+    async def upload(second: int) -> dict:
+        session = view.parse_fields({
+            "eml": EMAIL, "session": "1", "profileName": "Car",
+            "time": str(1697620000000 + second * 1000),
+            "kd": "10", "defaultUnit0d": "m/s"})
+        await view._async_publish_data(session)  # pylint: disable=protected-access
+        return view.coordinator.car_data("car")
+
+    assert "derived_trip_max_speed" not in await upload(0)
+    await hass.async_block_till_done()
+    assert units._registry is not None  # pylint: disable=protected-access
+    assert (await upload(1))["derived_trip_max_speed"] == pytest.approx(36)